@@ -0,0 +1,28 @@
+"""HNSW cosine index on embeddings
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-01-02 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Searches order by cosine distance (<=>), which the L2 ivfflat index cannot serve
+    op.execute('DROP INDEX IF EXISTS embeddings_embedding_ivfflat_idx;')
+    op.execute(
+        'CREATE INDEX embeddings_hnsw ON embeddings '
+        'USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS embeddings_hnsw;')
+    op.execute('CREATE INDEX embeddings_embedding_ivfflat_idx ON embeddings USING ivfflat (embedding vector_l2_ops);')
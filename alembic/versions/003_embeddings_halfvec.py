@@ -0,0 +1,36 @@
+"""Half-precision copy of embeddings for the HNSW index
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-01-03 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Kept in sync by Postgres; the index and candidate scan read 2 bytes per dimension
+    op.execute(
+        'ALTER TABLE embeddings ADD COLUMN embedding_half halfvec(384) '
+        'GENERATED ALWAYS AS (embedding::halfvec(384)) STORED;'
+    )
+    op.execute('DROP INDEX IF EXISTS embeddings_hnsw;')
+    op.execute(
+        'CREATE INDEX embeddings_half_hnsw ON embeddings '
+        'USING hnsw (embedding_half halfvec_cosine_ops) WITH (m = 16, ef_construction = 64);'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS embeddings_half_hnsw;')
+    op.execute('ALTER TABLE embeddings DROP COLUMN IF EXISTS embedding_half;')
+    op.execute(
+        'CREATE INDEX embeddings_hnsw ON embeddings '
+        'USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);'
+    )
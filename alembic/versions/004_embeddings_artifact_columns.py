@@ -0,0 +1,33 @@
+"""Copy artifact type/meta onto embeddings
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-01-04 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Vector searches read these from the embeddings row instead of joining artifacts
+    op.add_column('embeddings', sa.Column('artifact_type', sa.String(length=50), nullable=True))
+    op.add_column('embeddings', sa.Column('artifact_meta', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.execute(
+        'UPDATE embeddings e SET artifact_type = a.type, artifact_meta = a.meta::jsonb '
+        'FROM artifacts a WHERE e.artifact_id = a.id;'
+    )
+    op.create_index('ix_embeddings_artifact_type', 'embeddings', ['artifact_type'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_embeddings_artifact_type', table_name='embeddings')
+    op.drop_column('embeddings', 'artifact_meta')
+    op.drop_column('embeddings', 'artifact_type')
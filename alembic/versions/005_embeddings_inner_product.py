@@ -0,0 +1,33 @@
+"""Unit-length embeddings searched by inner product
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-01-05 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # New rows are normalized by the store; bring existing ones in line
+    # (embedding_half is generated, so it follows)
+    op.execute('UPDATE embeddings SET embedding = l2_normalize(embedding) WHERE embedding IS NOT NULL;')
+    op.execute('DROP INDEX IF EXISTS embeddings_half_hnsw;')
+    op.execute(
+        'CREATE INDEX embeddings_half_hnsw ON embeddings '
+        'USING hnsw (embedding_half halfvec_ip_ops) WITH (m = 16, ef_construction = 64);'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS embeddings_half_hnsw;')
+    op.execute(
+        'CREATE INDEX embeddings_half_hnsw ON embeddings '
+        'USING hnsw (embedding_half halfvec_cosine_ops) WITH (m = 16, ef_construction = 64);'
+    )
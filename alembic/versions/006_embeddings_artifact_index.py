@@ -0,0 +1,23 @@
+"""Index embeddings by artifact
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-01-06 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-artifact deletes and lookups; the foreign key alone is not indexed
+    op.create_index('ix_embeddings_artifact_id_chunk_idx', 'embeddings', ['artifact_id', 'chunk_idx'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_embeddings_artifact_id_chunk_idx', table_name='embeddings')
@@ -1,14 +1,20 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+import asyncio
 import logging
 import os
 
 # Load env
 load_dotenv()
 
+# Persist numba JIT output (librosa kernels, frame metrics) across worker
+# restarts; must be set before numba is first imported
+os.environ.setdefault("NUMBA_CACHE_DIR", "/tmp/numba_cache")
+
 # Routers
 from apps.api.routers.cv import router as cv_router
 from apps.api.routers.upload import router as upload_router
@@ -23,7 +29,7 @@ from apps.api.interview_routes import router as interview_router
 from apps.api.routers.optimized_interview_routes import router as optimized_interview_router
 
 # DB
-from core.db import connect_to_mongo, close_mongo_connection
+from core.db import connect_to_mongo, close_mongo_connection, get_collection_names, mongo_connected, ping_mongo
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +40,9 @@ if ROOT_PATH and not ROOT_PATH.startswith("/"):
 
 print("🌐 ROOT_PATH:", ROOT_PATH or "(none)")
 
+# Pay librosa import + JIT compile at startup instead of on the first audio request
+VOICE_WARMUP = os.getenv("VOICE_WARMUP", "1") == "1"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -44,8 +53,20 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️  MongoDB connection failed: {e}")
         logger.info("⚠️  Continuing without MongoDB - V2 endpoints will work (in-memory sessions)")
+    if VOICE_WARMUP:
+        try:
+            from interview.voice_analyzer import voice_analyzer
+            await asyncio.to_thread(voice_analyzer.warmup)
+            logger.info("✅ Voice analyzer warmed up")
+        except Exception as e:
+            logger.warning(f"⚠️  Voice analyzer warm-up failed: {e}")
     yield
     logger.info("🛑 Shutting down...")
+    try:
+        from interview.evaluate.judge import close_client as close_judge_client
+        await close_judge_client()
+    except Exception as e:
+        logger.warning(f"⚠️  Judge client close error: {e}")
     try:
         await close_mongo_connection()
         logger.info("✅ Mongo disconnected")
@@ -87,6 +108,29 @@ def create_app() -> FastAPI:
             "version": "1.0.0",
         }
 
+    @app.get("/healthz/mongo", tags=["Health"])
+    async def mongo_health():
+        # 503 so load balancers / k8s probes treat an unreachable Mongo as unhealthy;
+        # error details stay in the server log, not in this unauthenticated response
+        try:
+            connected = await ping_mongo()
+        except Exception as e:
+            logger.warning(f"⚠️  Mongo health check failed: {e}")
+            return JSONResponse(status_code=503, content={"status": "error", "mongo": "unreachable"})
+        if not connected:
+            return JSONResponse(status_code=503, content={"status": "error", "mongo": "not connected"})
+        return {"status": "ok", "mongo": "ok"}
+
+    @app.get("/healthz/mongo/collections", tags=["Health"])
+    async def mongo_collections():
+        if not mongo_connected():
+            return JSONResponse(status_code=503, content={"status": "error", "mongo": "not connected"})
+        try:
+            return {"collections": await get_collection_names()}
+        except Exception as e:
+            logger.warning(f"⚠️  Listing Mongo collections failed: {e}")
+            return JSONResponse(status_code=503, content={"status": "error", "mongo": "unreachable"})
+
     # Routers
     app.include_router(overview_router, tags=["Overview"])
     app.include_router(cv_router, tags=["CV"])
@@ -1,27 +1,74 @@
-from cv_eval.llm_scorer import LLMScorer
+import asyncio
+from typing import Any, Dict, Iterator, Optional
+from cv_eval.llm_scorer import LLMScorer, TRANSIENT_LLM_ERRORS
 import logging
 
 logger = logging.getLogger(__name__)
 
 class CVEvaluationEngine:
-    def __init__(self):
+    def __init__(self, fallback: Optional["CVEvaluationEngine"] = None):
         self.llm_scorer = LLMScorer()
+        # Pre-built engine (anything with .evaluate(cv_text, jd_text)) used when
+        # Groq is rate-limited or unavailable
+        self.fallback = fallback
     
     def evaluate(self, cv_text: str, jd_text: str = ""):
         """Evaluate CV using LLM scorer"""
         try:
             return self.llm_scorer.unified_evaluate(cv_text, jd_text)
+        except TRANSIENT_LLM_ERRORS as e:
+            if self.fallback is None:
+                return self._error_result(e, jd_text)
+            logger.warning(f"LLM evaluation unavailable, using fallback engine: {e}")
+            return self.fallback.evaluate(cv_text, jd_text)
         except Exception as e:
-            logger.error(f"LLM evaluation failed: {e}")
-            # Fallback to basic response
-            return {
-                "cv_quality": {
-                    "overall_score": 0,
-                    "band": "Error",
-                    "subscores": []
-                },
-                "jd_match": {} if not jd_text else {"overall_score": 0, "band": "Error", "subscores": []},
-                "fit_index": {} if not jd_text else {"score": 0, "band": "Error"}
-            }
+            return self._error_result(e, jd_text)
+    
+    async def evaluate_async(self, cv_text: str, jd_text: str = ""):
+        """evaluate() for async callers: the Groq request does not block the event loop"""
+        try:
+            return await self.llm_scorer.unified_evaluate_async(cv_text, jd_text)
+        except TRANSIENT_LLM_ERRORS as e:
+            if self.fallback is None:
+                return self._error_result(e, jd_text)
+            logger.warning(f"LLM evaluation unavailable, using fallback engine: {e}")
+            if hasattr(self.fallback, "evaluate_async"):
+                return await self.fallback.evaluate_async(cv_text, jd_text)
+            return await asyncio.to_thread(self.fallback.evaluate, cv_text, jd_text)
+        except Exception as e:
+            return self._error_result(e, jd_text)
+    
+    def evaluate_stream(self, cv_text: str, jd_text: str = "") -> Iterator[Dict[str, Any]]:
+        """evaluate() as events: {"type": "delta", "content": ...} while Groq generates,
+        then one {"type": "result", "result": ...} with the same dict evaluate() returns"""
+        parts = []
+        try:
+            for delta in self.llm_scorer.unified_evaluate_stream(cv_text, jd_text):
+                parts.append(delta)
+                yield {"type": "delta", "content": delta}
+            result = self.llm_scorer.parse_response("".join(parts))
+        except TRANSIENT_LLM_ERRORS as e:
+            if self.fallback is None:
+                result = self._error_result(e, jd_text)
+            else:
+                logger.warning(f"LLM evaluation unavailable, using fallback engine: {e}")
+                result = self.fallback.evaluate(cv_text, jd_text)
+        except Exception as e:
+            result = self._error_result(e, jd_text)
+        yield {"type": "result", "result": result}
+    
+    @staticmethod
+    def _error_result(e: Exception, jd_text: str):
+        logger.error(f"LLM evaluation failed: {e}")
+        # Fallback to basic response
+        return {
+            "cv_quality": {
+                "overall_score": 0,
+                "band": "Error",
+                "subscores": []
+            },
+            "jd_match": {} if not jd_text else {"overall_score": 0, "band": "Error", "subscores": []},
+            "fit_index": {} if not jd_text else {"score": 0, "band": "Error"}
+        }
 
 evaluation_engine = CVEvaluationEngine()
\ No newline at end of file
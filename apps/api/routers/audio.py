@@ -4,7 +4,7 @@ import tempfile
 import os
 
 from interview.speech_to_text import speech_converter
-from interview.voice_analyzer import VoiceAnalyzer
+from interview.voice_analyzer import voice_analyzer
 from interview.video_analyzer import video_analyzer
 from core.models import Session as SessionModel, Answer
 from core.schemas import AnswerCreate
@@ -12,7 +12,6 @@ import uuid
 from datetime import datetime
 
 router = APIRouter()
-voice_analyzer = VoiceAnalyzer()
 
 @router.post("/{session_id}/answer")
 async def submit_audio_answer(
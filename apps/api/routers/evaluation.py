@@ -21,7 +21,7 @@ async def evaluate_cv_jd(request: CVEvaluationRequest):
                 detail="Job description text cannot be empty"
             )
 
-        result = evaluation_engine.evaluate(request.cv_text, request.jd_text)
+        result = await evaluation_engine.evaluate_async(request.cv_text, request.jd_text)
         return result   # returns raw dict/JSON from engine
 
     except Exception as e:
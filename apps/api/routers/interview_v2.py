@@ -17,11 +17,10 @@ from core.schemas import (
     InterviewV2CompleteResponse
 )
 from interview.gemini_interviewer import gemini_interviewer
-from interview.voice_analyzer import VoiceAnalyzer
+from interview.voice_analyzer import voice_analyzer
 from core.db import get_database
 
 router = APIRouter(prefix="/v2/interview")
-voice_analyzer = VoiceAnalyzer(sample_rate=16000)
 
 
 async def fetch_resume_content(resume_id: str) -> str:
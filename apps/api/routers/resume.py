@@ -328,7 +328,7 @@ async def upload_resume(
         print("=" * 80)
         
         # Evaluate CV quality
-        cv_evaluation = evaluation_engine.evaluate(cv_text, jd_text or "")
+        cv_evaluation = await evaluation_engine.evaluate_async(cv_text, jd_text or "")
         
         # Get improvement suggestions if JD provided
         improvement_data = None
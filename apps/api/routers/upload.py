@@ -151,13 +151,13 @@ async def upload_and_evaluate_cv(
         cv_text = save_and_extract(file)
 
         if jd_text and jd_text.strip():
-            return evaluation_engine.evaluate(cv_text, jd_text)
+            return await evaluation_engine.evaluate_async(cv_text, jd_text)
 
         if jd_file is not None:
             jd_extracted = save_and_extract(jd_file)
-            return evaluation_engine.evaluate(cv_text, jd_extracted)
+            return await evaluation_engine.evaluate_async(cv_text, jd_extracted)
 
-        return evaluation_engine.evaluate(cv_text)
+        return await evaluation_engine.evaluate_async(cv_text)
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Evaluation failed: {str(e)}")
@@ -0,0 +1,11 @@
+"""
+Root conftest: makes the repository root importable for the top-level
+test scripts, so none of them needs its own sys.path hack.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = str(Path(__file__).resolve().parent)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
@@ -5,6 +5,8 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # --- Database ---
     mongo_uri: str = Field(env="MONGO_URI")
+    mongo_max_pool_size: int = Field(default=50, env="MONGO_MAX_POOL_SIZE")
+    mongo_min_pool_size: int = Field(default=5, env="MONGO_MIN_POOL_SIZE")
 
     # --- LLM / Evaluation ---
     llm_model: Optional[str] = Field(default=None, env="LLM_MODEL")
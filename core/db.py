@@ -1,3 +1,6 @@
+import asyncio
+import time
+from typing import List
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 from core.config import settings
@@ -7,11 +10,22 @@ from core.models import User, Session, Artifact, Question, Answer, Score, Report
 client: AsyncIOMotorClient = None
 database = None
 
+# Collection names are cached at startup and refreshed at most once per interval
+COLLECTION_NAMES_TTL = 60.0
+_collection_names: List[str] = []
+_collection_names_at = 0.0
+_collection_names_lock = asyncio.Lock()
+
 
 async def connect_to_mongo():
     """Create database connection"""
     global client, database
-    client = AsyncIOMotorClient(settings.mongo_uri)
+    # minPoolSize keeps warm connections open so early requests skip the TLS handshake
+    client = AsyncIOMotorClient(
+        settings.mongo_uri,
+        maxPoolSize=settings.mongo_max_pool_size,
+        minPoolSize=settings.mongo_min_pool_size
+    )
     database = client.get_default_database()
     
     # Initialize Beanie with document models
@@ -30,6 +44,7 @@ async def connect_to_mongo():
             JobDescription
         ]
     )
+    await get_collection_names(refresh=True)
 
 
 async def close_mongo_connection():
@@ -39,6 +54,34 @@ async def close_mongo_connection():
         client.close()
 
 
+async def get_collection_names(refresh: bool = False) -> List[str]:
+    """Cached collection names; re-listed under a lock once the cache is stale"""
+    global _collection_names, _collection_names_at
+    if not refresh and time.monotonic() - _collection_names_at < COLLECTION_NAMES_TTL:
+        return _collection_names
+    async with _collection_names_lock:
+        # Another caller may have refreshed while we waited for the lock
+        if refresh or time.monotonic() - _collection_names_at >= COLLECTION_NAMES_TTL:
+            # nameOnly (set by the driver) + authorizedCollections: the cheap
+            # listCollections form, which also works without listCollections privilege
+            _collection_names = await database.list_collection_names(authorizedCollections=True)
+            _collection_names_at = time.monotonic()
+    return _collection_names
+
+
+def mongo_connected() -> bool:
+    """Whether connect_to_mongo() has set up the database (no round-trip)"""
+    return database is not None
+
+
+async def ping_mongo() -> bool:
+    """Single round-trip liveness check"""
+    if not mongo_connected():
+        return False
+    await database.command("ping")
+    return True
+
+
 async def get_database():
     """Get database instance"""
     return database
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from beanie import Document, Indexed, Link
 from pydantic import Field
 from pymongo import IndexModel, TEXT
@@ -151,12 +151,16 @@ class Embedding(Document):
     artifact_id: str
     chunk_idx: int
     content: str
-    embedding: List[float]  # Vector embeddings as list of floats
+    embedding: Union[bytes, List[float]]  # Packed float32 BSON vector (legacy docs: list of floats)
+    artifact_type: Optional[str] = None  # Copied from the artifact so search needs no join
+    artifact_meta: Optional[Dict[str, Any]] = None
+    bucket: Optional[int] = None  # Partition for concurrent search-matrix loads
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "embeddings"
         indexes = [
             IndexModel([("artifact_id", 1), ("chunk_idx", 1)]),
+            IndexModel([("bucket", 1)]),
             IndexModel([("content", TEXT)])
         ]
\ No newline at end of file
@@ -281,39 +281,103 @@
 # cv_eval/llm_scorer.py
 
 
-import json, time, logging, os
+import asyncio, json, time, logging, os
+from string import Formatter
+from typing import Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 from .prompts import UNIFIED_EVALUATION_PROMPT, CV_ONLY_EVALUATION_PROMPT, IMPROVEMENT_PROMPT
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Rate limits, 5xx and network failures are worth retrying or routing to a
+# fallback; anything else (auth, bad request) is raised immediately
+try:
+    from groq import APIConnectionError, InternalServerError, RateLimitError
+    TRANSIENT_LLM_ERRORS = (APIConnectionError, InternalServerError, RateLimitError)
+except ImportError:
+    TRANSIENT_LLM_ERRORS = ()
+
+
+def _loads(text: str):
+    """Parse the model's JSON; orjson.JSONDecodeError subclasses json.JSONDecodeError"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _compile_prompt(template: str) -> List[Tuple[str, Optional[str]]]:
+    """Parse a str.format template once into (literal, field) pieces ({{ }} already unescaped)"""
+    return [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+
+def _render_prompt(pieces: List[Tuple[str, Optional[str]]], **values: str) -> str:
+    """Same result as template.format(**values), without re-parsing the template"""
+    return "".join(
+        literal + values[field] if field is not None else literal
+        for literal, field in pieces
+    )
+
+
+# The prompts are long and full of escaped JSON braces; parse them once at import
+_UNIFIED_PROMPT = _compile_prompt(UNIFIED_EVALUATION_PROMPT)
+_CV_ONLY_PROMPT = _compile_prompt(CV_ONLY_EVALUATION_PROMPT)
+_IMPROVEMENT_PROMPT = _compile_prompt(IMPROVEMENT_PROMPT)
+
+
 class LLMScorer:
     def __init__(self, client=None, model="llama-3.1-8b-instant", temperature=0.0, timeout=60):
         from groq import Groq
         self.client = client or Groq()
+        self._async_client = None
         self.model = model
         self.temperature = temperature
         self.timeout = timeout
 
     # ---------- CV vs JD (auto-switch) ----------
     def unified_evaluate(self, cv_text: str, jd_text: str = "") -> dict:
-        if jd_text and jd_text.strip():
-            prompt = UNIFIED_EVALUATION_PROMPT.format(cv_text=cv_text, jd_text=jd_text)
-        else:
-            prompt = CV_ONLY_EVALUATION_PROMPT.format(cv_text=cv_text)
+        raw = self._call_llm(self._evaluation_prompt(cv_text, jd_text))
+        cleaned = self._extract_json_from_response(raw)
+        return _loads(cleaned)
 
-        raw = self._call_llm(prompt)
+    async def unified_evaluate_async(self, cv_text: str, jd_text: str = "") -> dict:
+        """unified_evaluate without blocking the event loop; concurrent calls overlap"""
+        raw = await self._call_llm_async(self._evaluation_prompt(cv_text, jd_text))
         cleaned = self._extract_json_from_response(raw)
-        return json.loads(cleaned)
+        return _loads(cleaned)
+
+    def unified_evaluate_stream(self, cv_text: str, jd_text: str = "") -> Iterator[str]:
+        """Yield the model's text as Groq generates it; parse the joined text with parse_response"""
+        stream = self._call_llm(self._evaluation_prompt(cv_text, jd_text), stream=True)
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    @classmethod
+    def parse_response(cls, raw: str) -> dict:
+        return _loads(cls._extract_json_from_response(raw.strip()))
+
+    @staticmethod
+    def _evaluation_prompt(cv_text: str, jd_text: str) -> str:
+        if jd_text and jd_text.strip():
+            return _render_prompt(_UNIFIED_PROMPT, cv_text=cv_text, jd_text=jd_text)
+        return _render_prompt(_CV_ONLY_PROMPT, cv_text=cv_text)
 
     # ---------- CV only (legacy alias) ----------
     def evaluate_cv_only(self, cv_text: str) -> dict:
         return self.unified_evaluate(cv_text=cv_text, jd_text="")
 
     # ---------- Internals ----------
-    def _call_llm(self, prompt: str) -> str:
+    def _call_llm(self, prompt: str, stream: bool = False):
+        """Response text, or the chunk iterator when stream=True (retries cover opening the stream only)"""
         for attempt in range(3):
             try:
                 resp = self.client.chat.completions.create(
@@ -324,22 +388,47 @@ class LLMScorer:
                     ],
                     temperature=self.temperature,
                     max_tokens=3500,
+                    stream=stream,
                 )
+                if stream:
+                    return resp
                 return resp.choices[0].message.content.strip()
-            except Exception as e:
+            except TRANSIENT_LLM_ERRORS as e:
                 logger.error(f"Groq API call failed (attempt {attempt+1}/3): {e}")
                 if attempt == 2:
                     raise
                 time.sleep(1.5 ** attempt)
     
+    async def _call_llm_async(self, prompt: str) -> str:
+        if self._async_client is None:
+            from groq import AsyncGroq
+            self._async_client = AsyncGroq()
+        for attempt in range(3):
+            try:
+                resp = await self._async_client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": "You are a strict JSON generator."},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=self.temperature,
+                    max_tokens=3500,
+                )
+                return resp.choices[0].message.content.strip()
+            except TRANSIENT_LLM_ERRORS as e:
+                logger.error(f"Groq API call failed (attempt {attempt+1}/3): {e}")
+                if attempt == 2:
+                    raise
+                await asyncio.sleep(1.5 ** attempt)
+    
     def improvement(self, cv_text: str, jd_text: str) -> dict:
         if not cv_text.strip() or not jd_text.strip():
             raise ValueError("Both CV text and JD text are required for improvement")
 
-        prompt = IMPROVEMENT_PROMPT.format(cv_text=cv_text, jd_text=jd_text)
+        prompt = _render_prompt(_IMPROVEMENT_PROMPT, cv_text=cv_text, jd_text=jd_text)
         raw = self._call_llm(prompt)
         cleaned = self._extract_json_from_response(raw)
-        return json.loads(cleaned)
+        return _loads(cleaned)
 
 
     @staticmethod
@@ -0,0 +1,107 @@
+"""
+interview/evaluate/cache.py
+Two-tier cache for LLM answer evaluations: in-process LRU, then Redis.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the evaluation prompt or output shape changes to invalidate old entries
+EVAL_CACHE_VERSION = "v1"
+EVAL_CACHE_SIZE = int(os.getenv("EVAL_CACHE_SIZE", "512"))
+EVAL_CACHE_REDIS = os.getenv("EVAL_CACHE_REDIS", "0") == "1"
+EVAL_CACHE_TTL = int(os.getenv("EVAL_CACHE_TTL", "86400"))
+
+
+def _dumps(value) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def _loads(value):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def evaluation_key(**inputs) -> str:
+    """Stable key over everything that shapes the evaluation"""
+    digest = hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"eval:{EVAL_CACHE_VERSION}:{digest}"
+
+
+class EvaluationCache:
+    """Exact-match evaluation results; Redis errors disable the L2 tier"""
+
+    def __init__(self, maxsize: int, redis_url: Optional[str] = None, ttl: int = EVAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lru: "OrderedDict[str, dict]" = OrderedDict()
+        self._redis = None
+        if redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url)
+            except ImportError:
+                logger.warning("redis.asyncio not available; evaluation cache is in-process only")
+
+    async def get(self, key: str) -> Optional[dict]:
+        result = self._lru.get(key)
+        if result is not None:
+            self._lru.move_to_end(key)
+            return dict(result)
+
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(key)
+            except Exception as e:
+                logger.warning("Evaluation cache Redis lookup failed, disabling L2: %s", e)
+                self._redis = None
+                value = None
+            if value is not None:
+                result = _loads(value)
+                self._put_local(key, result)
+                return dict(result)
+        return None
+
+    async def set(self, key: str, result: dict) -> None:
+        self._put_local(key, dict(result))
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, _dumps(result), ex=self.ttl)
+        except Exception as e:
+            logger.warning("Evaluation cache Redis write failed, disabling L2: %s", e)
+            self._redis = None
+
+    def _put_local(self, key: str, result: dict) -> None:
+        self._lru[key] = result
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+
+def _redis_url() -> Optional[str]:
+    if not EVAL_CACHE_REDIS:
+        return None
+    from core.config import settings
+    return settings.redis_url
+
+
+evaluation_cache = EvaluationCache(EVAL_CACHE_SIZE, _redis_url())
@@ -3,11 +3,13 @@ interview/evaluate/judge.py
 Evaluates a candidate's answer using Groq.
 """
 
+import asyncio
 import os
 import httpx
 import json
 import logging
 from interview.prompts import BASE_EVALUATION_PROMPT
+from interview.evaluate.cache import evaluation_cache, evaluation_key
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,33 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 GROQ_MODEL = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")
 
+# Shared client so concurrent evaluations reuse pooled TLS connections. An
+# AsyncClient is bound to the loop it first ran on, so it is rebuilt when
+# called from a different loop (a later asyncio.run, a new test loop).
+_client: httpx.AsyncClient = None
+_client_loop: asyncio.AbstractEventLoop = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=25,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client; call on shutdown from the loop that used it"""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
 
 def safe_json(text: str):
     """Extract valid JSON."""
@@ -44,6 +73,14 @@ async def evaluate_answer(user_answer: str, question: str, jd: str, cv: str, sta
             "summary": "No answer provided."
         }
 
+    # Temperature-0 evaluations of identical inputs are reused across calls/runs
+    cache_key = evaluation_key(
+        model=GROQ_MODEL, answer=user_answer, question=question, jd=jd, cv=cv, stage=stage
+    )
+    cached = await evaluation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # --- FIX: Pass actual question, JD, and CV to prompt ---
     prompt = BASE_EVALUATION_PROMPT.format(
         stage=stage,
@@ -69,8 +106,7 @@ async def evaluate_answer(user_answer: str, question: str, jd: str, cv: str, sta
     }
 
     try:
-        async with httpx.AsyncClient(timeout=25) as client:
-            resp = await client.post(GROQ_API_URL, headers=headers, json=payload)
+        resp = await _get_client().post(GROQ_API_URL, headers=headers, json=payload)
 
         data = resp.json()
         logger.info("Groq eval response: %s", data)
@@ -80,17 +116,23 @@ async def evaluate_answer(user_answer: str, question: str, jd: str, cv: str, sta
 
         content = data["choices"][0]["message"]["content"]
         result = safe_json(content)
+        if "error" in result:
+            return _fallback(user_answer, result["error"])
 
         # Force technical_depth to 0 for non-technical stages
         if stage in ["intro", "hr", "behavioral", "managerial", "wrap-up"]:
             result["technical_depth"] = 0
 
-        return {
+        evaluation = {
             "clarity": int(result.get("clarity", 5)),
             "confidence": int(result.get("confidence", 5)),
             "technical_depth": int(result.get("technical_depth", 0)),
             "summary": result.get("summary", "(No summary provided)"),
         }
+        # Only parsed results are cached; fallbacks (Groq errors, malformed JSON)
+        # are retried next time
+        await evaluation_cache.set(cache_key, evaluation)
+        return evaluation
 
     except Exception as e:
         logger.exception("Evaluation failed:")
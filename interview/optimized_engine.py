@@ -7,6 +7,7 @@ Optimized Interview Engine using LangGraph with best practices
 """
 
 import asyncio
+import hashlib
 import json
 import time
 from typing import Dict, Any, List, Optional, AsyncIterator
@@ -29,6 +30,11 @@ logger = logging.getLogger(__name__)
 genai.configure(api_key=settings.gemini_api_key)
 
 
+def content_hash(text: str) -> str:
+    """Cache key for CV/JD content: 128-bit blake2b, no cryptographic requirement"""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
 # ============================================================================
 # State Definitions
 # ============================================================================
@@ -47,6 +53,7 @@ class OptimizedInterviewState(TypedDict):
     company: str
     cv_text: str
     jd_text: str
+    cv_hash: Optional[str]  # content_hash(cv_text), computed once per session
     
     # Context cache (computed once, reused)
     cv_summary: Optional[str]
@@ -170,10 +177,9 @@ class ContextAnalyzer:
     def __init__(self):
         self.model = genai.GenerativeModel('gemini-2.5-flash')  # Best stable model - fast with 1M token support
     
-    async def analyze_cv(self, cv_text: str) -> Dict[str, Any]:
-        """Extract key information from CV (cached)"""
-        import hashlib
-        cv_hash = hashlib.md5(cv_text.encode()).hexdigest()
+    async def analyze_cv(self, cv_text: str, cv_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Extract key information from CV (cached by cv_hash, computed if not given)"""
+        cv_hash = cv_hash or content_hash(cv_text)
         
         # Check cache first
         cached = await cache.get_cv_analysis(cv_hash)
@@ -565,7 +571,7 @@ class OptimizedInterviewGraph:
             return state
         
         # Analyze in parallel
-        cv_task = self.context_analyzer.analyze_cv(state["cv_text"])
+        cv_task = self.context_analyzer.analyze_cv(state["cv_text"], state.get("cv_hash"))
         jd_task = self.context_analyzer.analyze_jd(state["jd_text"])
         
         cv_analysis, jd_analysis = await asyncio.gather(cv_task, jd_task)
@@ -671,9 +677,10 @@ class OptimizedInterviewEngine:
         role: str,
         company: str,
         cv_text: str,
-        jd_text: str
+        jd_text: str,
+        cv_hash: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Create new interview session"""
+        """Create new interview session; pass cv_hash if the caller already hashed cv_text"""
         # Check cache first
         cached_state = await cache.get_session(session_id)
         if cached_state:
@@ -692,6 +699,7 @@ class OptimizedInterviewEngine:
             "company": company,
             "cv_text": cv_text,
             "jd_text": jd_text,
+            "cv_hash": cv_hash or content_hash(cv_text),
             "cv_summary": None,
             "jd_requirements": None,
             "candidate_skills": None,
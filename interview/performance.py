@@ -139,22 +139,22 @@ def track_llm_call(model: str, operation: str):
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start = time.time()
+            start = time.perf_counter()
             try:
                 result = await func(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start
+                duration = time.perf_counter() - start
                 monitor.record_llm_call(duration, model, operation)
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start = time.time()
+            start = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start
+                duration = time.perf_counter() - start
                 monitor.record_llm_call(duration, model, operation)
         
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
@@ -166,22 +166,22 @@ def track_api_request(endpoint: str):
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start = time.time()
+            start = time.perf_counter()
             try:
                 result = await func(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start
+                duration = time.perf_counter() - start
                 monitor.record_api_request(endpoint, duration)
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start = time.time()
+            start = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start
+                duration = time.perf_counter() - start
                 monitor.record_api_request(endpoint, duration)
         
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
@@ -191,11 +191,11 @@ def track_api_request(endpoint: str):
 @asynccontextmanager
 async def track_operation(name: str, operation_type: str = "general"):
     """Context manager for tracking any operation"""
-    start = time.time()
+    start = time.perf_counter()
     try:
         yield
     finally:
-        duration = time.time() - start
+        duration = time.perf_counter() - start
         logger.info(f"⏱️ {operation_type}: {name} took {duration:.2f}s")
         
         if operation_type == "llm":
@@ -213,11 +213,11 @@ class RequestTimer:
         self.end_time = None
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         return self
     
     def __exit__(self, *args):
-        self.end_time = time.time()
+        self.end_time = time.perf_counter()
         duration = self.end_time - self.start_time
         logger.info(f"⏱️ {self.name}: {duration:.3f}s")
     
@@ -1,26 +1,146 @@
 import cv2
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 import tempfile
 import os
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels run as plain NumPy code without numba"""
+        def decorator(func):
+            return func
+        return decorator
+
+# Path to a MediaPipe ``face_landmarker.task`` bundle. When set, the Tasks API
+# FaceLandmarker (GPU delegate, falling back to CPU) replaces legacy FaceMesh.
+FACE_LANDMARKER_MODEL = os.getenv("FACE_LANDMARKER_MODEL")
+
+# Frames whose 16x16 thumbnail differs from the last analyzed frame by less
+# than this mean absolute pixel difference reuse that frame's landmarks.
+FRAME_DIFF_THRESHOLD = float(os.getenv("VIDEO_FRAME_DIFF_THRESHOLD", "2.0"))
+_THUMB_SIZE = (16, 16)
+
+# Analyze every Nth frame; skipped frames are grabbed without being decoded
+FRAME_STRIDE = max(1, int(os.getenv("VIDEO_FRAME_STRIDE", "1")))
+
+
+@njit(cache=True, fastmath=True)
+def _frame_metrics(arr):
+    """Compute (eye_contact, ear, yaw, pitch) from an (N, 3) landmark array.
+
+    Fuses eye contact, eye aspect ratio and head pose into one pass so the
+    landmark array is read once per frame.
+
+    Eye contact is a gaze proxy built from the base 468-point mesh only, so
+    FaceMesh can run without the iris refinement model (roughly half the
+    inference cost). It is less precise than iris tracking but keeps the same
+    [0, 1] range and 0.15 deviation threshold.
+    """
+    # Eye contact: eyelid midpoints (which follow the iris) within the eye
+    # corners, combined with the nose tip offset from the inner eye corners
+    eye_score = 0.0
+    left_eye_width = abs(arr[133, 0] - arr[33, 0])
+    right_eye_width = abs(arr[263, 0] - arr[362, 0])
+    interocular = abs(arr[263, 0] - arr[33, 0])
+    if left_eye_width > 0 and right_eye_width > 0 and interocular > 0:
+        left_lid_pos = ((arr[159, 0] + arr[145, 0]) / 2 - arr[33, 0]) / left_eye_width
+        right_lid_pos = ((arr[386, 0] + arr[374, 0]) / 2 - arr[362, 0]) / right_eye_width
+        lid_deviation = (abs(left_lid_pos - 0.5) + abs(right_lid_pos - 0.5)) / 2
+        nose_deviation = abs(arr[1, 0] - (arr[133, 0] + arr[362, 0]) / 2) / interocular
+        # Deviation from center; > 0.15 means looking away
+        avg_deviation = (lid_deviation + nose_deviation) / 2
+        if avg_deviation <= 0.15:
+            eye_score = min(1.0, max(0.0, 1.0 - avg_deviation / 0.15))
+
+    # Eye Aspect Ratio (left eye: 33, 160, 158, 133, 153, 144)
+    v1 = np.sqrt((arr[160, 0] - arr[144, 0]) ** 2 + (arr[160, 1] - arr[144, 1]) ** 2)
+    v2 = np.sqrt((arr[158, 0] - arr[153, 0]) ** 2 + (arr[158, 1] - arr[153, 1]) ** 2)
+    h = np.sqrt((arr[33, 0] - arr[133, 0]) ** 2 + (arr[33, 1] - arr[133, 1]) ** 2)
+    ear = (v1 + v2) / (2.0 * h) if h > 0 else 0.0
+
+    # Head pose: nose offset from eye center (normalized yaw/pitch)
+    yaw = (arr[1, 0] - (arr[33, 0] + arr[263, 0]) / 2) * 100
+    pitch = (arr[1, 1] - (arr[33, 1] + arr[263, 1]) / 2) * 100
+
+    return eye_score, ear, yaw, pitch
+
+
 class VideoAnalyzer:
     """Analyze video for interview behavior and cheating detection"""
     
     def __init__(self):
+        self.mp_face_mesh = None
+        self.face_mesh = None
+        self.landmarker = None
+        # VIDEO running mode requires monotonically increasing timestamps for
+        # the lifetime of the landmarker, so keep counting across videos.
+        self._timestamp_ms = 0
+
         try:
             import mediapipe as mp
-            self.mp_face_mesh = mp.solutions.face_mesh
-            self.face_mesh = self.mp_face_mesh.FaceMesh(
-                max_num_faces=2,
-                refine_landmarks=True,
-                min_detection_confidence=0.5,
-                min_tracking_confidence=0.5
-            )
         except Exception as e:
             print(f"Warning: MediaPipe initialization failed: {e}")
-            self.mp_face_mesh = None
-            self.face_mesh = None
+            return
+
+        if FACE_LANDMARKER_MODEL and os.path.exists(FACE_LANDMARKER_MODEL):
+            self.landmarker = self._create_landmarker(mp)
+
+        if self.landmarker is None:
+            try:
+                self.mp_face_mesh = mp.solutions.face_mesh
+                self.face_mesh = self.mp_face_mesh.FaceMesh(
+                    max_num_faces=2,
+                    # Iris landmarks are not needed by the eye-contact proxy
+                    refine_landmarks=False,
+                    min_detection_confidence=0.5,
+                    min_tracking_confidence=0.5
+                )
+            except Exception as e:
+                print(f"Warning: MediaPipe initialization failed: {e}")
+                self.mp_face_mesh = None
+                self.face_mesh = None
+
+    def _create_landmarker(self, mp):
+        """Create a Tasks API FaceLandmarker, preferring the GPU delegate"""
+        vision = mp.tasks.vision
+        BaseOptions = mp.tasks.BaseOptions
+
+        for delegate in (BaseOptions.Delegate.GPU, BaseOptions.Delegate.CPU):
+            try:
+                options = vision.FaceLandmarkerOptions(
+                    base_options=BaseOptions(
+                        model_asset_path=FACE_LANDMARKER_MODEL,
+                        delegate=delegate
+                    ),
+                    running_mode=vision.RunningMode.VIDEO,
+                    num_faces=2,
+                    min_face_detection_confidence=0.5,
+                    min_tracking_confidence=0.5,
+                    output_face_blendshapes=False
+                )
+                return vision.FaceLandmarker.create_from_options(options)
+            except Exception as e:
+                print(f"Warning: FaceLandmarker ({delegate.name}) initialization failed: {e}")
+        return None
+
+    def _detect_faces(self, rgb_frame: np.ndarray, frame_time_ms: float) -> List[Sequence]:
+        """Run face landmark detection and return one landmark list per face"""
+        if self.landmarker is not None:
+            import mediapipe as mp
+            self._timestamp_ms = max(self._timestamp_ms + 1, int(frame_time_ms))
+            image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+            result = self.landmarker.detect_for_video(image, self._timestamp_ms)
+            return result.face_landmarks or []
+
+        results = self.face_mesh.process(rgb_frame)
+        if not results.multi_face_landmarks:
+            return []
+        return [face.landmark for face in results.multi_face_landmarks]
         
     def analyze_video(self, video_data: bytes) -> Dict[str, Any]:
         """Main analysis function"""
@@ -40,7 +160,7 @@ class VideoAnalyzer:
         """Process video and extract metrics"""
         
         # If MediaPipe failed to initialize, return mock data
-        if not self.face_mesh:
+        if not self.face_mesh and not self.landmarker:
             return self._get_mock_results()
         
         cap = cv2.VideoCapture(video_path)
@@ -49,64 +169,93 @@ class VideoAnalyzer:
         duration = total_frames / fps if fps > 0 else 0
         
         # Metrics
-        face_detected_frames = 0
         multiple_faces_frames = 0
-        looking_away_frames = 0
         blink_count = 0
-        head_movements = []
-        eye_contact_scores = []
+        # Per-frame metrics in preallocated columns (SoA), indexed by sampled
+        # frame. CAP_PROP_FRAME_COUNT is only an estimate, so columns grow on overflow.
+        stride = FRAME_STRIDE
+        capacity = max(-(-total_frames // stride), 1)
+        head = np.zeros((capacity, 2), dtype=np.float32)  # yaw, pitch
+        eye = np.zeros(capacity, dtype=np.float32)
+        has_face = np.zeros(capacity, dtype=np.bool_)
         
         prev_ear = None
         frame_count = 0
+        sample_count = 0
+        # Offset so timestamps keep increasing across videos (Tasks API VIDEO mode)
+        video_start_ms = self._timestamp_ms
+        frame_interval_ms = 1000.0 / fps if fps > 0 else 33.0
+        # Near-duplicate frame detection against the last analyzed frame
+        prev_thumb = None
+        faces = []
+        metrics = None
+        diff_limit = FRAME_DIFF_THRESHOLD * _THUMB_SIZE[0] * _THUMB_SIZE[1] * 3
         
         while cap.isOpened():
             ret, frame = cap.read()
             if not ret:
                 break
             
+            idx = sample_count
+            sample_count += 1
             frame_count += 1
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.face_mesh.process(rgb_frame)
+            if idx >= capacity:
+                head = np.concatenate((head, np.zeros_like(head)))
+                eye = np.concatenate((eye, np.zeros_like(eye)))
+                has_face = np.concatenate((has_face, np.zeros_like(has_face)))
+                capacity *= 2
+            
+            thumb = cv2.resize(frame, _THUMB_SIZE, interpolation=cv2.INTER_AREA)
+            if prev_thumb is None or cv2.norm(thumb, prev_thumb, cv2.NORM_L1) >= diff_limit:
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                faces = self._detect_faces(rgb_frame, video_start_ms + frame_count * frame_interval_ms)
+                prev_thumb = thumb
+                # Analyze first face
+                metrics = _frame_metrics(self._landmarks_to_array(faces[0])) if faces else None
             
-            if results.multi_face_landmarks:
-                num_faces = len(results.multi_face_landmarks)
-                face_detected_frames += 1
+            if metrics is not None:
+                eye_score, ear, yaw, pitch = metrics
+                has_face[idx] = True
                 
-                if num_faces > 1:
+                if len(faces) > 1:
                     multiple_faces_frames += 1
                 
-                # Analyze first face
-                landmarks = results.multi_face_landmarks[0]
-                
                 # Eye contact
-                eye_score = self._calculate_eye_contact(landmarks)
-                eye_contact_scores.append(eye_score)
-                
-                # Stricter threshold for looking away
-                if eye_score < 0.3:
-                    looking_away_frames += 1
+                eye[idx] = eye_score
                 
                 # Blink detection
-                ear = self._calculate_ear(landmarks)
                 if prev_ear and prev_ear > 0.2 and ear < 0.2:
                     blink_count += 1
                 prev_ear = ear
                 
                 # Head movement
-                head_pose = self._calculate_head_pose(landmarks)
-                head_movements.append(head_pose)
+                head[idx, 0] = yaw
+                head[idx, 1] = pitch
+            
+            # Advance past the frames between samples without decoding them
+            for _ in range(stride - 1):
+                if not cap.grab():
+                    break
+                frame_count += 1
         
         cap.release()
         
+        # Column reductions over sampled frames with a detected face
+        face_eye = eye[:sample_count][has_face[:sample_count]]
+        face_head = head[:sample_count][has_face[:sample_count]]
+        face_detected_frames = int(face_eye.size)
+        # Stricter threshold for looking away
+        looking_away_frames = int(np.count_nonzero(face_eye < 0.3))
+        
         # Calculate metrics
-        face_presence = (face_detected_frames / frame_count) * 100 if frame_count > 0 else 0
-        multiple_faces_pct = (multiple_faces_frames / frame_count) * 100 if frame_count > 0 else 0
+        face_presence = (face_detected_frames / sample_count) * 100 if sample_count > 0 else 0
+        multiple_faces_pct = (multiple_faces_frames / sample_count) * 100 if sample_count > 0 else 0
         looking_away_pct = (looking_away_frames / face_detected_frames) * 100 if face_detected_frames > 0 else 0
-        avg_eye_contact = np.mean(eye_contact_scores) if eye_contact_scores else 0
+        avg_eye_contact = float(face_eye.mean()) if face_detected_frames else 0.0
         blink_rate = (blink_count / duration) * 60 if duration > 0 else 0
         
         # Head movement analysis
-        head_stability = self._analyze_head_stability(head_movements)
+        head_stability = self._analyze_head_stability(face_head)
         
         # Cheating detection
         cheating_indicators = self._detect_cheating(
@@ -142,93 +291,17 @@ class VideoAnalyzer:
             )
         }
     
-    def _calculate_eye_contact(self, landmarks) -> float:
-        """Calculate eye contact score based on iris position and gaze direction"""
-        try:
-            # Get iris landmarks (468-473 left, 473-478 right)
-            left_iris_center = landmarks.landmark[468]
-            right_iris_center = landmarks.landmark[473]
-            
-            # Get eye corner landmarks for reference frame
-            left_eye_left = landmarks.landmark[33]   # Left corner of left eye
-            left_eye_right = landmarks.landmark[133] # Right corner of left eye
-            right_eye_left = landmarks.landmark[362] # Left corner of right eye  
-            right_eye_right = landmarks.landmark[263] # Right corner of right eye
-            
-            # Calculate horizontal position of iris within eye (0 = far left, 1 = far right)
-            left_eye_width = abs(left_eye_right.x - left_eye_left.x)
-            right_eye_width = abs(right_eye_right.x - right_eye_left.x)
-            
-            if left_eye_width == 0 or right_eye_width == 0:
-                return 0.0
-            
-            # Iris position relative to eye (0.5 = center)
-            left_iris_pos = (left_iris_center.x - left_eye_left.x) / left_eye_width
-            right_iris_pos = (right_iris_center.x - right_eye_left.x) / right_eye_width
-            
-            # Calculate deviation from center (0.5)
-            # If looking at camera, iris should be centered (around 0.4-0.6)
-            left_deviation = abs(left_iris_pos - 0.5)
-            right_deviation = abs(right_iris_pos - 0.5)
-            
-            # Average deviation
-            avg_deviation = (left_deviation + right_deviation) / 2
-            
-            # Convert to score: 0 deviation = 1.0 score, 0.5 deviation = 0.0 score
-            # Threshold: deviation > 0.15 means looking away
-            if avg_deviation > 0.15:
-                score = 0.0
-            else:
-                score = 1.0 - (avg_deviation / 0.15)
-            
-            return max(0.0, min(1.0, score))
-        except Exception:
-            return 0.0
-    
-    def _calculate_ear(self, landmarks) -> float:
-        """Calculate Eye Aspect Ratio for blink detection"""
-        # Left eye landmarks
-        left_eye = [landmarks.landmark[i] for i in [33, 160, 158, 133, 153, 144]]
-        
-        # Vertical distances
-        v1 = np.linalg.norm(np.array([left_eye[1].x, left_eye[1].y]) - 
-                           np.array([left_eye[5].x, left_eye[5].y]))
-        v2 = np.linalg.norm(np.array([left_eye[2].x, left_eye[2].y]) - 
-                           np.array([left_eye[4].x, left_eye[4].y]))
-        
-        # Horizontal distance
-        h = np.linalg.norm(np.array([left_eye[0].x, left_eye[0].y]) - 
-                          np.array([left_eye[3].x, left_eye[3].y]))
-        
-        ear = (v1 + v2) / (2.0 * h) if h > 0 else 0
-        return ear
-    
-    def _calculate_head_pose(self, landmarks) -> Dict[str, float]:
-        """Calculate head pose angles"""
-        # Key points for head pose
-        nose = landmarks.landmark[1]
-        left_eye = landmarks.landmark[33]
-        right_eye = landmarks.landmark[263]
-        
-        # Simple yaw calculation (left-right rotation)
-        eye_center_x = (left_eye.x + right_eye.x) / 2
-        yaw = (nose.x - eye_center_x) * 100  # Normalized
-        
-        # Simple pitch calculation (up-down rotation)
-        pitch = (nose.y - ((left_eye.y + right_eye.y) / 2)) * 100
-        
-        return {"yaw": yaw, "pitch": pitch}
+    @staticmethod
+    def _landmarks_to_array(landmarks: Sequence) -> np.ndarray:
+        """Pack MediaPipe landmarks into a contiguous (N, 3) float32 array"""
+        return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
     
-    def _analyze_head_stability(self, head_movements: List[Dict]) -> float:
-        """Analyze head movement stability"""
-        if len(head_movements) < 2:
+    def _analyze_head_stability(self, head_poses: np.ndarray) -> float:
+        """Analyze head movement stability from an (N, 2) yaw/pitch array"""
+        if len(head_poses) < 2:
             return 1.0
         
-        yaws = [m["yaw"] for m in head_movements]
-        pitches = [m["pitch"] for m in head_movements]
-        
-        yaw_std = np.std(yaws)
-        pitch_std = np.std(pitches)
+        yaw_std, pitch_std = (float(v) for v in np.std(head_poses, axis=0))
         
         # Lower std = more stable (score closer to 1.0)
         stability = 1.0 / (1.0 + (yaw_std + pitch_std) / 20)
@@ -359,3 +432,11 @@ class VideoAnalyzer:
 
 # Global instance
 video_analyzer = VideoAnalyzer()
+
+# Compile the frame kernel at import so the first analysis request does not
+# pay JIT latency (cache=True also persists it across worker restarts)
+if NUMBA_AVAILABLE:
+    try:
+        _frame_metrics(np.zeros((468, 3), dtype=np.float32))
+    except Exception as e:
+        print(f"Warning: frame metrics kernel warm-up failed: {e}")
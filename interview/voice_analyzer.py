@@ -3,7 +3,7 @@ Voice Analysis Module for Interview Evaluation
 Analyzes speech patterns, fluency, confidence proxies, and delivery characteristics.
 
 Improvements:
-- Uses librosa.pyin for robust pitch estimation
+- Uses pyworld DIO + StoneMask (or librosa.yin) for fast pitch estimation
 - Speech rate uses transcript-based WPM when provided
 - Confidence scoring based on stability/control
 - Explicit analysis_ok + error fields
@@ -12,22 +12,31 @@ Improvements:
 
 from __future__ import annotations
 
+import importlib.util
 import io
 import os
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union
 
-import librosa
 import numpy as np
-import requests
-import soundfile as sf
+
+# pydub is only needed for non-WAV/FLAC/OGG uploads and probes for ffmpeg on
+# import, so only its presence is checked here; it is imported on first use
+PYDUB_AVAILABLE = importlib.util.find_spec("pydub") is not None
 
 try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
+    import numpy_rms
+    NUMPY_RMS_AVAILABLE = True
 except ImportError:
-    PYDUB_AVAILABLE = False
-    AudioSegment = None
+    NUMPY_RMS_AVAILABLE = False
+    numpy_rms = None
+
+try:
+    import pyworld
+    PYWORLD_AVAILABLE = True
+except ImportError:
+    PYWORLD_AVAILABLE = False
+    pyworld = None
 
 
 logger = logging.getLogger(__name__)
@@ -35,6 +44,17 @@ if not logger.handlers:
     logging.basicConfig(level=logging.INFO)
 
 
+def _incl(x: float) -> float:
+    """Bin edge that keeps x itself in the lower bucket (an inclusive `<= x`)"""
+    return float(np.nextafter(x, np.inf))
+
+
+def _piecewise(x, table):
+    """Score delta for x from a (bins, deltas) step table; works on scalars and arrays"""
+    bins, deltas = table
+    return deltas[np.searchsorted(bins, x, side="right")]
+
+
 class VoiceAnalyzer:
     """
     VoiceAnalyzer computes delivery-related metrics from audio and
@@ -50,6 +70,61 @@ class VoiceAnalyzer:
         "pace": 1.0,
         "total": 6.0,
     }
+    # Precomputed from SCORE_MAX: reported weights (share of total, 3 dp) and
+    # the factor mapping each raw score onto 0-10
+    _WEIGHTS = {"fluency": 0.333, "clarity": 0.25, "confidence": 0.25, "pace": 0.167}
+    _SCORE_KEYS = ("fluency", "clarity", "confidence", "pace", "total")
+    _SCALE_10 = np.array([10.0 / 2.0, 10.0 / 1.5, 10.0 / 1.5, 10.0 / 1.0, 10.0 / 6.0])
+
+    # voice_metrics fields rounded together, with 10**decimals per field
+    _METRIC_KEYS = ("duration", "speech_rate", "avg_pitch", "pitch_variation", "avg_energy", "pause_ratio", "speech_duration")
+    _METRIC_SCALE = np.array([1e2, 1e1, 1e1, 1e1, 1e4, 1e3, 1e2])
+
+    # Speech F0 lies well below 4 kHz, so pitch is tracked on 8 kHz audio
+    PITCH_SAMPLE_RATE = 8000
+    # Speaking-voice F0 search range, D2-G4 (librosa.note_to_hz, precomputed)
+    FMIN_HZ = 73.42
+    FMAX_HZ = 392.00
+
+    # Container magic bytes libsndfile decodes natively (WAV, FLAC, OGG)
+    _SOUNDFILE_MAGIC = (b"RIFF", b"fLaC", b"OggS")
+
+    # Shared RMS framing for VAD, energy and pitch voicing (librosa defaults)
+    FRAME_LENGTH = 2048
+    HOP_LENGTH = 512
+    SILENCE_TOP_DB = 25
+
+    # Below these, pitch tracking cannot find enough voiced frames to matter
+    MIN_PITCH_SPEECH_SECONDS = 0.3
+    MIN_PITCH_MEAN_RMS = 1e-4
+
+    # yin framing at PITCH_SAMPLE_RATE: 128 ms frames with a 32 ms hop
+    _YIN_FRAME = 1024
+    _YIN_HOP = 256
+    # yin always reports a lag, so frames are kept only when the signal repeats
+    # at it: power-normalised difference (0 = periodic, ~1 = noise) at most this
+    YIN_MAX_APERIODICITY = 0.3
+
+    # Step tables for the rubric: (bin edges, deltas) where deltas[i] applies
+    # between edges i-1 and i. _incl(x) edges make the band end `<= x`.
+    _FLUENCY_WPM = (
+        np.array([90, 105, 120, _incl(175), _incl(190), _incl(210)]),
+        np.array([-0.3, 0.0, 0.3, 0.5, 0.3, 0.0, -0.3]),
+    )
+    _FLUENCY_PAUSE = (
+        np.array([0.05, 0.08, 0.12, _incl(0.28), _incl(0.35), _incl(0.45)]),
+        np.array([-0.2, 0.0, 0.3, 0.5, 0.3, 0.0, -0.4]),
+    )
+    _CLARITY_ENERGY = (np.array([0.006, 0.01]), np.array([-0.2, 0.15, 0.3]))
+    _CLARITY_DURATION = (np.array([4, 8]), np.array([0.0, 0.1, 0.2]))
+    _CONFIDENCE_PITCH_STD = (np.array([_incl(25), _incl(40)]), np.array([0.4, 0.2, -0.2]))
+    _CONFIDENCE_ENERGY = (np.array([0.004, 0.01]), np.array([-0.1, 0.0, 0.2]))
+    _CONFIDENCE_WPM = (np.array([90, 115, _incl(190), _incl(210)]), np.array([-0.2, 0.0, 0.3, 0.0, -0.2]))
+    _PACE_WPM = (
+        np.array([90, 105, 125, _incl(175), _incl(195), _incl(210)]),
+        np.array([-0.2, 0.0, 0.3, 0.5, 0.3, 0.0, -0.2]),
+    )
+    _PACE_DURATION = (np.array([6]), np.array([0.0, 0.1]))
 
     def __init__(self, sample_rate: int = 16000):
         self.sample_rate = sample_rate
@@ -62,68 +137,192 @@ class VoiceAnalyzer:
         audio_url: str = None,
         transcript: Optional[str] = None,
     ) -> Dict[str, Any]:
+        # Empty uploads / keep-alive pings: answer before touching the decoder
+        if not audio_data and not audio_url:
+            return self._fail("no_audio_data")
         try:
-            if audio_url:
-                audio_data = self._download_audio(audio_url)
-
-            if not audio_data:
-                return self._fail("no_audio_data")
+            y, error = self._load_audio(audio_data, audio_url)
+        except Exception as e:
+            logger.exception("Voice analysis error: %s", e)
+            return self._fail("voice_analysis_exception")
+        if error:
+            return self._fail(error)
+        return self._analyze_decoded(y, transcript)
+
+    def analyze_voice_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze several clips; each item holds analyze_voice keyword arguments
+        (audio_data / audio_url / transcript). Results keep input order.
+
+        On the yin path pitch is tracked for all decoded clips in one call on a
+        zero-padded (N, T) array, sharing librosa's per-call overhead. Frames
+        overhanging a clip's edges are dropped, so the padding never counts.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        decoded = []
+        for i, item in enumerate(items):
+            try:
+                y, error = self._load_audio(item.get("audio_data"), item.get("audio_url"))
+            except Exception as e:
+                logger.exception("Voice analysis error: %s", e)
+                y, error = None, "voice_analysis_exception"
+            if error:
+                results[i] = self._fail(error)
+            else:
+                decoded.append((i, y))
 
-            # -------- IN-MEMORY AUDIO DECODE (NO TEMP FILES) --------
-            # Convert any audio format to WAV using pydub, then read with soundfile
+        yin_f0 = [None] * len(decoded)
+        if len(decoded) > 1 and not PYWORLD_AVAILABLE:
             try:
-                audio_buffer = io.BytesIO(audio_data)
-                
-                if PYDUB_AVAILABLE:
-                    # Load audio with pydub (auto-detects format)
-                    audio_segment = AudioSegment.from_file(audio_buffer)
-                    
-                    # Convert to WAV in memory
-                    wav_buffer = io.BytesIO()
-                    audio_segment.export(wav_buffer, format="wav")
-                    wav_buffer.seek(0)
-                    
-                    # Now read WAV with soundfile
-                    y, sr = sf.read(wav_buffer, dtype="float32")
-                else:
-                    # Try direct soundfile read (works for WAV)
-                    y, sr = sf.read(audio_buffer, dtype="float32")
-                    
-            except Exception as format_error:
-                logger.error(f"Audio format conversion failed: {format_error}")
-                return self._fail("audio_format_conversion_failed")
-
-            if y is None or len(y) == 0:
-                return self._fail("empty_audio_after_decode")
-
-            # Convert to mono if needed
-            if y.ndim > 1:
-                y = np.mean(y, axis=1)
-
-            # Resample if needed
-            if sr != self.sample_rate:
-                y = librosa.resample(y, orig_sr=sr, target_sr=self.sample_rate)
-                sr = self.sample_rate
-
-            analysis = self._analyze_audio_features(y, sr, transcript)
+                yin_f0 = self._yin_batch([y for _, y in decoded])
+            except Exception as e:
+                logger.warning("Batch pitch tracking failed, tracking per clip: %s", e)
+
+        for (i, y), f0 in zip(decoded, yin_f0):
+            results[i] = self._analyze_decoded(y, items[i].get("transcript"), f0)
+        return results
+
+    def _analyze_decoded(
+        self,
+        y: np.ndarray,
+        transcript: Optional[str],
+        yin_f0: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        try:
+            analysis = self._analyze_audio_features(y, self.sample_rate, transcript, yin_f0)
             analysis["analysis_ok"] = True
             return analysis
-
         except Exception as e:
             logger.exception("Voice analysis error: %s", e)
             return self._fail("voice_analysis_exception")
 
+    def warmup(self) -> None:
+        """
+        Run the full feature pipeline once on a synthetic voiced clip so the
+        lazy librosa import and its numba-compiled kernels (yin, resampling)
+        are paid at startup rather than by the first request.
+        """
+        t = np.arange(2 * self.sample_rate, dtype=np.float32) / self.sample_rate
+        y = (0.1 * np.sin(2 * np.pi * 150.0 * t)).astype(np.float32)
+        self._analyze_audio_features(y, self.sample_rate, None)
+
     # ------------------------- AUDIO INGEST -------------------------
 
-    def _download_audio(self, url: str) -> Optional[bytes]:
+    def _load_audio(
+        self,
+        audio_data: Union[bytes, io.BytesIO, None],
+        audio_url: Optional[str],
+    ) -> Tuple[Optional[np.ndarray], Optional[str]]:
+        """Decode to mono float32 at self.sample_rate; returns (samples, error code)"""
+        if audio_url:
+            audio_data = self._download_audio(audio_url)
+
+        if isinstance(audio_data, (bytes, bytearray)):
+            audio_data = io.BytesIO(audio_data)
+
+        if audio_data is None or audio_data.getbuffer().nbytes == 0:
+            return None, "no_audio_data"
+
+        # -------- IN-MEMORY AUDIO DECODE (NO TEMP FILES) --------
+        # WAV/FLAC/OGG go straight to soundfile; anything else (webm, mp3,
+        # m4a) is converted to WAV via pydub/ffmpeg first
+        try:
+            audio_buffer = audio_data
+            native = audio_buffer.read(4) in self._SOUNDFILE_MAGIC
+            audio_buffer.seek(0)
+
+            if native or not PYDUB_AVAILABLE:
+                try:
+                    y, sr = self._read_mono(audio_buffer)
+                except Exception:
+                    # e.g. an OGG codec this libsndfile build lacks
+                    if not PYDUB_AVAILABLE:
+                        raise
+                    audio_buffer.seek(0)
+                    y, sr = self._read_via_pydub(audio_buffer)
+            else:
+                y, sr = self._read_via_pydub(audio_buffer)
+
+        except Exception as format_error:
+            logger.error(f"Audio format conversion failed: {format_error}")
+            return None, "audio_format_conversion_failed"
+
+        if y is None or len(y) == 0:
+            return None, "empty_audio_after_decode"
+
+        # Resample if needed (a <1% rate mismatch is irrelevant for these stats)
+        if abs(sr - self.sample_rate) / sr >= 0.01:
+            y = self._resample(y, sr, self.sample_rate)
+        return y, None
+
+    def _download_audio(self, url: str) -> Optional[io.BytesIO]:
+        """Stream the body straight into the buffer the decoder reads from"""
+        import requests
+
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                return response.content
+            with requests.get(url, stream=True, timeout=10) as response:
+                if response.status_code == 200:
+                    buf = io.BytesIO()
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        buf.write(chunk)
+                    buf.seek(0)
+                    return buf
         except Exception:
             pass
         return None
 
+    @classmethod
+    def _read_via_pydub(cls, source) -> Tuple[np.ndarray, int]:
+        """Transcode any ffmpeg-readable format to WAV in memory, then decode"""
+        from pydub import AudioSegment
+
+        audio_segment = AudioSegment.from_file(source)
+        wav_buffer = io.BytesIO()
+        audio_segment.export(wav_buffer, format="wav")
+        wav_buffer.seek(0)
+        return cls._read_mono(wav_buffer)
+
+    @staticmethod
+    def _read_mono(source, block_frames: int = 65536) -> Tuple[np.ndarray, int]:
+        """Decode to float32 mono, averaging channels block-wise into one buffer"""
+        import soundfile as sf
+
+        with sf.SoundFile(source) as f:
+            sr = f.samplerate
+            if f.channels == 1:
+                return f.read(dtype="float32"), sr
+
+            # frames may be unknown for some containers; fall back to a full read
+            if f.frames <= 0:
+                return f.read(dtype="float32", always_2d=True).mean(axis=1, dtype=np.float32), sr
+
+            y = np.empty(f.frames, dtype=np.float32)
+            block = np.empty((block_frames, f.channels), dtype=np.float32)
+            scale = np.float32(1.0 / f.channels)
+            pos = 0
+            while pos < f.frames:
+                n = f.read(out=block).shape[0]
+                if n == 0:
+                    break
+                np.sum(block[:n], axis=1, out=y[pos:pos + n])
+                pos += n
+            y = y[:pos]
+            y *= scale
+            return y, sr
+
+    @staticmethod
+    def _resample(y: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+        """
+        Fast resampling for analysis (not listening) quality: polyphase
+        decimation for integer ratios (e.g. 48k -> 16k), soxr_qq otherwise.
+        """
+        import librosa
+        from scipy.signal import resample_poly
+
+        if orig_sr > target_sr and orig_sr % target_sr == 0:
+            return resample_poly(y, 1, orig_sr // target_sr).astype(np.float32, copy=False)
+        return librosa.resample(y, orig_sr=orig_sr, target_sr=target_sr, res_type="soxr_qq")
+
     # ------------------------- FEATURE EXTRACTION -------------------------
 
     def _analyze_audio_features(
@@ -131,18 +330,30 @@ class VoiceAnalyzer:
         y: np.ndarray,
         sr: int,
         transcript: Optional[str],
+        yin_f0: Optional[np.ndarray] = None,
     ) -> Dict[str, Any]:
 
         duration = float(len(y) / sr)
 
-        intervals = librosa.effects.split(y, top_db=25)
-        speech_duration = float(sum((e - s) / sr for s, e in intervals)) if len(intervals) else 0.0
+        # One framewise RMS pass feeds VAD, energy stats and pitch voicing
+        rms = self._frame_rms(y, self.FRAME_LENGTH, self.HOP_LENGTH)
+        nonsilent = self._nonsilent_frames(rms)
+        intervals = self._nonsilent_intervals(nonsilent, len(y))
+        speech_samples = int((intervals[:, 1] - intervals[:, 0]).sum())
+        speech_duration = speech_samples / sr
         pause_ratio = float(1.0 - (speech_duration / duration)) if duration > 0 else 1.0
         speech_segments = int(len(intervals))
 
-        speech_rate_wpm = self._speech_rate_wpm(duration, transcript, intervals, sr)
-        pitch_stats = self._analyze_pitch_pyin(y, sr)
-        energy_stats = self._analyze_energy(y)
+        speech_rate_wpm = self._speech_rate_wpm(duration, transcript, speech_duration)
+        energy_stats = self._analyze_energy(rms)
+
+        # Pitch tracking dominates runtime; skip it when it would come back empty
+        too_short = len(y) < 2 * self.FRAME_LENGTH or speech_duration < self.MIN_PITCH_SPEECH_SECONDS
+        silent = not (transcript and transcript.strip()) and energy_stats["mean"] < self.MIN_PITCH_MEAN_RMS
+        if too_short or silent:
+            pitch_stats = {"mean": 0.0, "std": 0.0, "range": 0.0}
+        else:
+            pitch_stats = self._analyze_pitch(y, sr, nonsilent, yin_f0)
 
         score_block = self._calculate_voice_scores(
             speech_rate_wpm,
@@ -152,60 +363,210 @@ class VoiceAnalyzer:
             duration,
         )
 
+        metrics = np.array([
+            duration,
+            speech_rate_wpm,
+            pitch_stats["mean"],
+            pitch_stats["std"],
+            energy_stats["mean"],
+            pause_ratio,
+            speech_duration,
+        ])
+        voice_metrics = dict(zip(self._METRIC_KEYS, self._round_scaled(metrics, self._METRIC_SCALE)))
+        voice_metrics["speech_segments"] = speech_segments
+        voice_metrics["wpm_source"] = "transcript" if transcript and transcript.strip() else "estimated"
+
         return {
             "voice_scores": score_block,
-            "voice_metrics": {
-                "duration": round(duration, 2),
-                "speech_rate": round(speech_rate_wpm, 1),
-                "avg_pitch": round(pitch_stats["mean"], 1),
-                "pitch_variation": round(pitch_stats["std"], 1),
-                "avg_energy": round(energy_stats["mean"], 4),
-                "pause_ratio": round(pause_ratio, 3),
-                "speech_segments": speech_segments,
-                "speech_duration": round(speech_duration, 2),
-                "wpm_source": "transcript" if transcript and transcript.strip() else "estimated",
-            },
+            "voice_metrics": voice_metrics,
         }
 
+    @staticmethod
+    def _round_scaled(values: np.ndarray, scale: np.ndarray) -> list:
+        """Round each value to its own number of decimals (scale = 10**decimals) in one pass"""
+        return (np.rint(values * scale) / scale).tolist()
+
     def _speech_rate_wpm(
         self,
         duration: float,
         transcript: Optional[str],
-        intervals: np.ndarray,
-        sr: int,
+        speech_duration: float,
     ) -> float:
         if transcript:
             words = [w for w in transcript.split() if w.strip()]
             return float((len(words) / duration) * 60.0) if duration > 0 else 0.0
 
-        if len(intervals) == 0 or duration <= 0:
+        if speech_duration <= 0 or duration <= 0:
             return 0.0
 
-        speech_duration = sum((e - s) / sr for s, e in intervals)
         est_words = 2.2 * speech_duration
         return float((est_words / duration) * 60.0)
 
-    def _analyze_pitch_pyin(self, y: np.ndarray, sr: int) -> Dict[str, float]:
+    def _analyze_pitch(
+        self,
+        y: np.ndarray,
+        sr: int,
+        nonsilent: np.ndarray,
+        yin_f0: Optional[np.ndarray] = None,
+    ) -> Dict[str, float]:
         try:
-            f0, _, _ = librosa.pyin(
-                y,
-                fmin=librosa.note_to_hz("C2"),
-                fmax=librosa.note_to_hz("C7"),
-            )
-            voiced_f0 = f0[~np.isnan(f0)] if f0 is not None else np.array([])
-            if voiced_f0.size == 0:
+            f0 = self._track_pitch(y, sr, nonsilent, yin_f0)
+            # Unvoiced frames are NaN; reduce over voiced ones without a masked copy
+            if f0 is None or f0.size == 0 or np.isnan(f0).all():
                 return {"mean": 0.0, "std": 0.0, "range": 0.0}
 
             return {
-                "mean": float(np.mean(voiced_f0)),
-                "std": float(np.std(voiced_f0)),
-                "range": float(np.ptp(voiced_f0)),
+                "mean": float(np.nanmean(f0)),
+                "std": float(np.nanstd(f0)),
+                "range": float(np.nanmax(f0) - np.nanmin(f0)),
             }
         except Exception:
             return {"mean": 0.0, "std": 0.0, "range": 0.0}
 
-    def _analyze_energy(self, y: np.ndarray) -> Dict[str, float]:
-        rms = librosa.feature.rms(y=y)[0]
+    def _track_pitch(
+        self,
+        y: np.ndarray,
+        sr: int,
+        nonsilent: np.ndarray,
+        yin_f0: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Frame-level F0 in Hz with NaN for unvoiced frames.
+
+        Only summary statistics are needed, so the HMM-decoded pyin contour is
+        not worth its cost: pyworld DIO + StoneMask is used when installed,
+        otherwise librosa.yin gated by the VAD's nonsilent frames and by a
+        periodicity check (yin has no voicing decision of its own).
+
+        The search range is limited to speaking voice (D2-G4, ~73-392 Hz) and
+        the signal is downsampled to PITCH_SAMPLE_RATE first, which shrinks
+        both the lag search and the number of frames.
+
+        yin_f0 is this clip's periodicity-gated yin output when already
+        computed in a batch (see analyze_voice_batch).
+        """
+        vad_frame_seconds = self.HOP_LENGTH / sr
+
+        if yin_f0 is not None:
+            f0 = yin_f0
+        else:
+            if sr > self.PITCH_SAMPLE_RATE:
+                y = self._resample(y, sr, self.PITCH_SAMPLE_RATE)
+                sr = self.PITCH_SAMPLE_RATE
+
+            if PYWORLD_AVAILABLE:
+                x = y.astype(np.float64)
+                f0, t = pyworld.dio(x, sr, f0_floor=self.FMIN_HZ, f0_ceil=self.FMAX_HZ, frame_period=20.0)
+                f0 = pyworld.stonemask(x, f0, t, sr)
+                f0[f0 <= 0] = np.nan
+                return f0
+
+            f0 = self._periodic_f0(y, self._yin(y))
+
+        # Map pitch frames onto the VAD frame grid (identical at 16 kHz input)
+        pitch_hop_seconds = self._YIN_HOP / self.PITCH_SAMPLE_RATE
+        vad_idx = np.rint(np.arange(f0.size) * pitch_hop_seconds / vad_frame_seconds).astype(np.intp)
+        voiced = nonsilent[np.minimum(vad_idx, nonsilent.size - 1)]
+        return np.where(voiced, f0, np.nan)
+
+    def _yin(self, y: np.ndarray) -> np.ndarray:
+        """Raw yin F0 of PITCH_SAMPLE_RATE audio; y may be (T,) or a (N, T) batch"""
+        import librosa
+
+        return librosa.yin(
+            y,
+            fmin=self.FMIN_HZ,
+            fmax=self.FMAX_HZ,
+            sr=self.PITCH_SAMPLE_RATE,
+            frame_length=self._YIN_FRAME,
+            hop_length=self._YIN_HOP,
+        )
+
+    def _periodic_f0(self, y: np.ndarray, f0: np.ndarray) -> np.ndarray:
+        """
+        NaN out yin frames of PITCH_SAMPLE_RATE audio y that overhang the clip
+        edges (centre padding) or do not repeat at the detected period.
+        """
+        f0 = np.asarray(f0, dtype=np.float64)
+        out = np.full(f0.size, np.nan)
+        starts = np.arange(f0.size) * self._YIN_HOP - self._YIN_FRAME // 2
+        inside = (starts >= 0) & (starts + self._YIN_FRAME <= len(y))
+        idx = np.flatnonzero(inside & np.isfinite(f0))
+        if idx.size == 0:
+            return out
+
+        # Compare each frame with itself one period later over a window that
+        # stays inside the frame for the longest period (FMIN_HZ)
+        lag = np.rint(self.PITCH_SAMPLE_RATE / f0[idx]).astype(np.intp)
+        width = self._YIN_FRAME - int(np.ceil(self.PITCH_SAMPLE_RATE / self.FMIN_HZ))
+        windows = np.lib.stride_tricks.sliding_window_view(np.asarray(y, dtype=np.float32), width)
+        a = windows[starts[idx]]
+        b = windows[starts[idx] + lag]
+        diff = a - b
+        power = np.einsum("ij,ij->i", a, a) + np.einsum("ij,ij->i", b, b)
+        aperiodicity = np.einsum("ij,ij->i", diff, diff) / np.maximum(power, 1e-12)
+        keep = aperiodicity <= self.YIN_MAX_APERIODICITY
+        out[idx[keep]] = f0[idx[keep]]
+        return out
+
+    def _yin_batch(self, clips: List[np.ndarray]) -> List[np.ndarray]:
+        """Per-clip periodicity-gated yin F0 from one call over the zero-padded clips"""
+        if self.sample_rate > self.PITCH_SAMPLE_RATE:
+            clips = [self._resample(y, self.sample_rate, self.PITCH_SAMPLE_RATE) for y in clips]
+        batch = np.zeros((len(clips), max(len(y) for y in clips)), dtype=np.float32)
+        for row, y in zip(batch, clips):
+            row[: len(y)] = y
+        f0 = self._yin(batch)
+        return [self._periodic_f0(y, f0[k, : 1 + len(y) // self._YIN_HOP]) for k, y in enumerate(clips)]
+
+    @staticmethod
+    def _frame_rms(y: np.ndarray, frame_length: int = 2048, hop_length: int = 512) -> np.ndarray:
+        """
+        Framewise RMS equivalent to librosa.feature.rms (center=True, zero
+        padding), computed from per-hop block energies instead of framing the
+        signal: block RMS comes from numpy-rms (C/SIMD) when installed, and
+        each frame sums frame_length // hop_length consecutive blocks.
+        """
+        blocks_per_frame = frame_length // hop_length
+        lead = (frame_length // 2) // hop_length
+        n_full, rem = divmod(len(y), hop_length)
+
+        # Block energies of the centre-padded signal, without materialising
+        # the padded copy: lead/trail pad blocks are zero and only the final
+        # partial block needs zero-filling
+        block_energy = np.zeros(n_full + blocks_per_frame, dtype=np.float64)
+        body = np.ascontiguousarray(y[: n_full * hop_length], dtype=np.float32)
+        if n_full:
+            if NUMPY_RMS_AVAILABLE:
+                block_energy[lead : lead + n_full] = np.square(numpy_rms.rms(body, window_size=hop_length), dtype=np.float64)
+            else:
+                blocks = body.reshape(n_full, hop_length)
+                block_energy[lead : lead + n_full] = np.einsum("ij,ij->i", blocks, blocks, dtype=np.float64) / hop_length
+        if rem:
+            tail = y[n_full * hop_length :].astype(np.float64)
+            block_energy[lead + n_full] = np.dot(tail, tail) / hop_length
+
+        csum = np.concatenate(([0.0], np.cumsum(block_energy)))
+        frame_energy = (csum[blocks_per_frame:] - csum[:-blocks_per_frame]) / blocks_per_frame
+        return np.sqrt(np.maximum(frame_energy, 0.0)).astype(np.float32)
+
+    def _nonsilent_frames(self, rms: np.ndarray) -> np.ndarray:
+        """Frames within SILENCE_TOP_DB of the loudest frame (as librosa.effects.split)"""
+        # Compare amplitudes directly instead of converting to dB; an all-zero
+        # clip has threshold 0 and so no nonsilent frames
+        if rms.size == 0:
+            return np.zeros(0, dtype=bool)
+        return rms > rms.max() * 10 ** (-self.SILENCE_TOP_DB / 20)
+
+    def _nonsilent_intervals(self, nonsilent: np.ndarray, n_samples: int) -> np.ndarray:
+        """Convert a nonsilent frame mask into (start, end) sample intervals"""
+        # +1 marks a run start and -1 a run end; padding closes runs at the edges
+        edges = np.diff(nonsilent.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1) * self.HOP_LENGTH
+        ends = np.minimum(np.flatnonzero(edges == -1) * self.HOP_LENGTH, n_samples)
+        return np.stack([starts, ends], axis=1)
+
+    def _analyze_energy(self, rms: np.ndarray) -> Dict[str, float]:
         return {
             "mean": float(np.mean(rms)) if rms.size else 0.0,
             "std": float(np.std(rms)) if rms.size else 0.0,
@@ -230,51 +591,23 @@ class VoiceAnalyzer:
 
         total = fluency + clarity + confidence + pace
 
-        raw = {
-            "fluency": round(fluency, 2),
-            "clarity": round(clarity, 2),
-            "confidence": round(confidence, 2),
-            "pace": round(pace, 2),
-            "total": round(total, 2),
-        }
-
-        scaled_out_of_10 = {
-            k: round((raw[k] / self.SCORE_MAX[k]) * 10.0, 2)
-            for k in raw
-        }
+        raw = np.round([fluency, clarity, confidence, pace, total], 2)
+        scaled_out_of_10 = np.round(raw * self._SCALE_10, 2)
 
         return {
-            "raw": raw,
-            "scaled_out_of_10": scaled_out_of_10,
-            "weights": {
-                "fluency": round(self.SCORE_MAX["fluency"] / self.SCORE_MAX["total"], 3),
-                "clarity": round(self.SCORE_MAX["clarity"] / self.SCORE_MAX["total"], 3),
-                "confidence": round(self.SCORE_MAX["confidence"] / self.SCORE_MAX["total"], 3),
-                "pace": round(self.SCORE_MAX["pace"] / self.SCORE_MAX["total"], 3),
-            },
+            "raw": dict(zip(self._SCORE_KEYS, raw.tolist())),
+            "scaled_out_of_10": dict(zip(self._SCORE_KEYS, scaled_out_of_10.tolist())),
+            # Copy so callers that mutate the result cannot alter the class table
+            "weights": dict(self._WEIGHTS),
         }
 
     # ------------------------- INDIVIDUAL SCORE FUNCTIONS -------------------------
 
     def _score_fluency(self, wpm: float, pause_ratio: float) -> float:
         score = 1.0
-        if 120 <= wpm <= 175:
-            score += 0.5
-        elif 105 <= wpm <= 190:
-            score += 0.3
-        elif wpm < 90 or wpm > 210:
-            score -= 0.3
-
-        if 0.12 <= pause_ratio <= 0.28:
-            score += 0.5
-        elif 0.08 <= pause_ratio <= 0.35:
-            score += 0.3
-        elif pause_ratio > 0.45:
-            score -= 0.4
-        elif pause_ratio < 0.05:
-            score -= 0.2
-
-        return float(max(0.0, min(2.0, score)))
+        score += _piecewise(wpm, self._FLUENCY_WPM)
+        score += _piecewise(pause_ratio, self._FLUENCY_PAUSE)
+        return float(np.clip(score, 0.0, 2.0))
 
     def _score_clarity(self, energy_stats: Dict[str, float], duration: float) -> float:
         score = 0.6
@@ -286,19 +619,9 @@ class VoiceAnalyzer:
         elif mean_e > 0 and std_e <= mean_e * 0.9:
             score += 0.2
 
-        if mean_e >= 0.01:
-            score += 0.3
-        elif mean_e >= 0.006:
-            score += 0.15
-        else:
-            score -= 0.2
-
-        if duration >= 8:
-            score += 0.2
-        elif duration >= 4:
-            score += 0.1
-
-        return float(max(0.0, min(1.5, score)))
+        score += _piecewise(mean_e, self._CLARITY_ENERGY)
+        score += _piecewise(duration, self._CLARITY_DURATION)
+        return float(np.clip(score, 0.0, 1.5))
 
     def _score_confidence(self, pitch_stats: Dict[str, float], energy_stats: Dict[str, float], wpm: float) -> float:
         score = 0.6
@@ -307,64 +630,46 @@ class VoiceAnalyzer:
         mean_e = energy_stats.get("mean", 0.0)
 
         if pitch_mean > 0:
-            if pitch_std <= 25:
-                score += 0.4
-            elif pitch_std <= 40:
-                score += 0.2
-            else:
-                score -= 0.2
-
-        if mean_e >= 0.01:
-            score += 0.2
-        elif mean_e < 0.004:
-            score -= 0.1
-
-        if 115 <= wpm <= 190:
-            score += 0.3
-        elif wpm < 90 or wpm > 210:
-            score -= 0.2
-
-        return float(max(0.0, min(1.5, score)))
+            score += _piecewise(pitch_std, self._CONFIDENCE_PITCH_STD)
+        score += _piecewise(mean_e, self._CONFIDENCE_ENERGY)
+        score += _piecewise(wpm, self._CONFIDENCE_WPM)
+        return float(np.clip(score, 0.0, 1.5))
 
     def _score_pace(self, wpm: float, duration: float) -> float:
         score = 0.4
-        if 125 <= wpm <= 175:
-            score += 0.5
-        elif 105 <= wpm <= 195:
-            score += 0.3
-        elif wpm < 90 or wpm > 210:
-            score -= 0.2
-
-        if duration >= 6:
-            score += 0.1
-
-        return float(max(0.0, min(1.0, score)))
+        score += _piecewise(wpm, self._PACE_WPM)
+        score += _piecewise(duration, self._PACE_DURATION)
+        return float(np.clip(score, 0.0, 1.0))
 
     # ------------------------- FAILURE -------------------------
 
+    # Zeroed results for failures; _fail hands out fresh copies because callers
+    # extend/serialize the result (a read-only mapping would break JSON encoding)
+    _ZERO_SCORES = dict.fromkeys(SCORE_MAX, 0.0)
+    _FAIL_METRICS = {
+        "duration": 0.0,
+        "speech_rate": 0.0,
+        "avg_pitch": 0.0,
+        "pitch_variation": 0.0,
+        "avg_energy": 0.0,
+        "pause_ratio": 1.0,
+        "speech_segments": 0,
+        "speech_duration": 0.0,
+        "wpm_source": "none",
+    }
+
     def _fail(self, code: str) -> Dict[str, Any]:
         return {
             "analysis_ok": False,
             "error": code,
             "voice_scores": {
-                "raw": {k: 0.0 for k in self.SCORE_MAX},
-                "scaled_out_of_10": {k: 0.0 for k in self.SCORE_MAX},
-                "weights": {
-                    "fluency": 0.333,
-                    "clarity": 0.25,
-                    "confidence": 0.25,
-                    "pace": 0.167,
-                },
-            },
-            "voice_metrics": {
-                "duration": 0.0,
-                "speech_rate": 0.0,
-                "avg_pitch": 0.0,
-                "pitch_variation": 0.0,
-                "avg_energy": 0.0,
-                "pause_ratio": 1.0,
-                "speech_segments": 0,
-                "speech_duration": 0.0,
-                "wpm_source": "none",
+                "raw": self._ZERO_SCORES.copy(),
+                "scaled_out_of_10": self._ZERO_SCORES.copy(),
+                "weights": self._WEIGHTS.copy(),
             },
+            "voice_metrics": self._FAIL_METRICS.copy(),
         }
+
+
+# librosa/soundfile/requests are imported on first use, so this is cheap at import
+voice_analyzer = VoiceAnalyzer()
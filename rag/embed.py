@@ -1,8 +1,117 @@
-from typing import List, Optional, Union
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Union
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from core.config import settings
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels run as plain NumPy code without numba"""
+        def decorator(func):
+            return func
+        return decorator
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    xxhash = None
+
+
+# Serve the local model from an INT8-quantized ONNX Runtime export (needs optimum[onnxruntime])
+EMBEDDINGS_ONNX_INT8 = os.getenv("EMBEDDINGS_ONNX_INT8", "0") == "1"
+ONNX_CACHE_DIR = os.getenv("EMBEDDINGS_ONNX_CACHE_DIR", os.path.join("models", "onnx"))
+
+# Intra-op threads for the local torch model; defaults to an even share of the
+# cores per uvicorn worker so N workers do not oversubscribe the CPU
+EMBEDDINGS_TORCH_THREADS = int(os.getenv(
+    "EMBEDDINGS_TORCH_THREADS",
+    str(max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", "1"))))
+))
+
+# Exact-match embedding cache: in-process LRU, optionally backed by Redis.
+# Entries are per worker (float32 rows, ~1.5KB at 384 dims); raise it where memory allows
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+EMBEDDING_CACHE_REDIS = os.getenv("EMBEDDING_CACHE_REDIS", "0") == "1"
+EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _dummy_kernel(seeds: np.ndarray, dim: int) -> np.ndarray:
+    """Unit-length Gaussian row per seed; rows are independent so they run in parallel"""
+    out = np.empty((seeds.shape[0], dim))
+    for i in prange(seeds.shape[0]):
+        np.random.seed(seeds[i])
+        row = np.random.normal(0.0, 1.0, dim)
+        out[i] = row / np.sqrt(np.sum(row * row))
+    return out
+
+
+class OnnxSentenceEncoder:
+    """
+    Drop-in for SentenceTransformer.encode backed by a dynamically quantized
+    (INT8, VNNI) ONNX Runtime export: tokenize, run the session, mean-pool
+    over the attention mask and L2-normalize, as the MiniLM ST pipeline does.
+    The export is built once and reused from ONNX_CACHE_DIR.
+    """
+    
+    QUANTIZED_FILE = "model_quantized.onnx"
+    
+    def __init__(self, model_name: str, max_length: int = 256):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+        
+        model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        export_dir = os.path.join(ONNX_CACHE_DIR, model_id.replace("/", "__"))
+        
+        if not os.path.exists(os.path.join(export_dir, self.QUANTIZED_FILE)):
+            fp32_model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+            fp32_model.save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_id).save_pretrained(export_dir)
+            quantizer = ORTQuantizer.from_pretrained(fp32_model)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=export_dir, quantization_config=qconfig)
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.session = ORTModelForFeatureExtraction.from_pretrained(
+            export_dir, file_name=self.QUANTIZED_FILE, provider="CPUExecutionProvider"
+        )
+        self.max_length = max_length
+        self.dim = self.session.config.hidden_size
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+    
+    def encode(self, texts: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Encode length-sorted batches and return rows in input order"""
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        for start in range(0, len(texts), batch_size):
+            idx = order[start:start + batch_size]
+            enc = self.tokenizer(
+                [texts[i] for i in idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            hidden = self.session(**enc).last_hidden_state
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            out[idx] = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return out
+
 
 class EmbeddingProvider:
     """Abstract base class for embedding providers"""
@@ -30,8 +139,21 @@ class LocalEmbeddingProvider(EmbeddingProvider):
     
     async def initialize(self):
         """Initialize the local embedding model"""
+        if EMBEDDINGS_ONNX_INT8:
+            try:
+                self.model = OnnxSentenceEncoder(self.model_name)
+                self.embedding_dim = self.model.get_sentence_embedding_dimension()
+                print(f"Local embedding model '{self.model_name}' initialized (ONNX Runtime INT8)")
+                return
+            except Exception as e:
+                print(f"ONNX INT8 embedding model unavailable, using sentence-transformers: {e}")
+        
         try:
+            import torch
+            torch.set_num_threads(EMBEDDINGS_TORCH_THREADS)
+            
             self.model = SentenceTransformer(self.model_name)
+            self.model.eval()
             self.embedding_dim = self.model.get_sentence_embedding_dimension()
             print(f"Local embedding model '{self.model_name}' initialized successfully")
         except Exception as e:
@@ -48,7 +170,7 @@ class LocalEmbeddingProvider(EmbeddingProvider):
             if isinstance(texts, str):
                 texts = [texts]
             
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
+            embeddings = self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
             return embeddings
         
         except Exception as e:
@@ -61,13 +183,20 @@ class LocalEmbeddingProvider(EmbeddingProvider):
             return self._generate_dummy_embeddings(texts)
         
         try:
-            all_embeddings = []
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                batch_embeddings = self.model.encode(batch, convert_to_numpy=True)
-                all_embeddings.append(batch_embeddings)
-            
-            return np.vstack(all_embeddings)
+            # Length-sort across the whole input so batches carry little padding,
+            # and write each batch straight into its rows of one float32 matrix
+            out = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+            order = np.argsort([-len(t) for t in texts], kind="stable")
+            for start in range(0, len(texts), batch_size):
+                idx = order[start:start + batch_size]
+                out[idx] = self.model.encode(
+                    [texts[i] for i in idx],
+                    batch_size=batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                )
+            return out
         
         except Exception as e:
             print(f"Local batch encoding failed, falling back to dummy embeddings: {e}")
@@ -78,20 +207,12 @@ class LocalEmbeddingProvider(EmbeddingProvider):
         if isinstance(texts, str):
             texts = [texts]
         
-        # Generate deterministic but random-looking embeddings
-        embeddings = []
-        for i, text in enumerate(texts):
-            # Use text hash to generate consistent embeddings
-            text_hash = hash(text) % (2**32)
-            np.random.seed(text_hash)
-            
-            # Generate embedding with some structure
-            embedding = np.random.normal(0, 1, self.embedding_dim)
-            # Normalize to unit vector
-            embedding = embedding / np.linalg.norm(embedding)
-            embeddings.append(embedding)
-        
-        return np.array(embeddings)
+        # Seed from a content digest: hash() is salted per process, so the
+        # vectors would change on every restart
+        seeds = np.fromiter(
+            (int(_text_key(text), 16) & 0xFFFFFFFF for text in texts), dtype=np.uint32, count=len(texts)
+        )
+        return _dummy_kernel(seeds, self.embedding_dim)
 
 
 class OpenAIEmbeddingProvider(EmbeddingProvider):
@@ -195,30 +316,192 @@ def get_embedding_provider() -> EmbeddingProvider:
         return LocalEmbeddingProvider()
 
 
+class QueryBatcher:
+    """
+    Coalesces concurrent single-text encodes (search queries) into one
+    provider call: the first waiting query opens a short window, and
+    everything queued within it, up to max_batch, is encoded together.
+    """
+    
+    def __init__(self, provider: EmbeddingProvider, max_batch: int = 64, max_wait: float = 0.005):
+        self.provider = provider
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def encode_one(self, text: str) -> np.ndarray:
+        """Embedding for a single text, resolved when its batch completes"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                embeddings = await self.provider.encode([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+def _text_key(text: str) -> str:
+    """Short stable digest of a text for cache keys"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(text.encode("utf-8"))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Exact-match embedding cache keyed on (provider, model, text digest).
+    Lookups hit an in-process LRU first, then Redis when configured; only
+    the remaining misses reach the provider, deduplicated, and results are
+    stitched back in input order. Rows are stored as float32.
+    """
+    
+    def __init__(self, maxsize: int, redis_url: Optional[str] = None, ttl: int = EMBEDDING_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._redis = None
+        if redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url)
+            except ImportError:
+                print("redis.asyncio not available; embedding cache is in-process only")
+    
+    async def get_or_encode(
+        self,
+        namespace: str,
+        texts: List[str],
+        encode: Callable[[List[str]], Awaitable[np.ndarray]]
+    ) -> np.ndarray:
+        keys = [f"emb:{namespace}:{_text_key(text)}" for text in texts]
+        rows: List[Optional[np.ndarray]] = [self._lru_get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        
+        if missing and self._redis is not None:
+            try:
+                values = await self._redis.mget([keys[i] for i in missing])
+                for i, value in zip(missing, values):
+                    if value is not None:
+                        rows[i] = np.frombuffer(value, dtype=np.float32)
+                        self._lru_put(keys[i], rows[i])
+            except Exception as e:
+                print(f"Embedding cache Redis lookup failed, disabling L2: {e}")
+                self._redis = None
+            missing = [i for i in missing if rows[i] is None]
+        
+        if missing:
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = np.asarray(await encode(unique_texts), dtype=np.float32)
+            by_text = dict(zip(unique_texts, encoded))
+            for i in missing:
+                rows[i] = by_text[texts[i]]
+                self._lru_put(keys[i], rows[i])
+            await self._redis_store({keys[i]: rows[i] for i in missing})
+        
+        if not rows:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(rows)
+    
+    def _lru_get(self, key: str) -> Optional[np.ndarray]:
+        row = self._lru.get(key)
+        if row is not None:
+            self._lru.move_to_end(key)
+        return row
+    
+    def _lru_put(self, key: str, row: np.ndarray) -> None:
+        self._lru[key] = row
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+    
+    async def _redis_store(self, rows: dict) -> None:
+        if self._redis is None or not rows:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, row in rows.items():
+                pipe.set(key, row.tobytes(), ex=self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            print(f"Embedding cache Redis write failed, disabling L2: {e}")
+            self._redis = None
+
+
 # Global embedding provider instance
 _embedding_provider: Optional[EmbeddingProvider] = None
+_query_batcher: Optional[QueryBatcher] = None
+_embedding_cache = EmbeddingCache(
+    EMBEDDING_CACHE_SIZE, settings.redis_url if EMBEDDING_CACHE_REDIS else None
+)
+
+
+def _cache_namespace(provider: EmbeddingProvider) -> str:
+    """Cache keys change with the provider/model so stale vectors are never served"""
+    return f"{type(provider).__name__}:{provider.model_name}"
 
 
 async def get_embeddings(texts: Union[str, List[str]]) -> np.ndarray:
     """Get embeddings for text(s) using the configured provider"""
-    global _embedding_provider
+    provider = await initialize_embeddings()
     
-    if _embedding_provider is None:
-        _embedding_provider = get_embedding_provider()
-        await _embedding_provider.initialize()
+    if isinstance(texts, str):
+        texts = [texts]
+    return await _embedding_cache.get_or_encode(_cache_namespace(provider), texts, provider.encode)
+
+
+async def get_query_embedding(text: str) -> np.ndarray:
+    """Get one query embedding, micro-batched with concurrent queries"""
+    global _query_batcher
+    
+    provider = await initialize_embeddings()
+    if _query_batcher is None or _query_batcher.provider is not provider:
+        _query_batcher = QueryBatcher(provider)
     
-    return await _embedding_provider.encode(texts)
+    async def encode(texts: List[str]) -> np.ndarray:
+        return np.asarray([await _query_batcher.encode_one(texts[0])])
+    
+    embeddings = await _embedding_cache.get_or_encode(_cache_namespace(provider), [text], encode)
+    return embeddings[0]
 
 
 async def get_embeddings_batch(texts: List[str], batch_size: int = 32) -> np.ndarray:
     """Get embeddings for texts in batches"""
-    global _embedding_provider
+    provider = await initialize_embeddings()
     
-    if _embedding_provider is None:
-        _embedding_provider = get_embedding_provider()
-        await _embedding_provider.initialize()
+    async def encode(missing: List[str]) -> np.ndarray:
+        return await provider.encode_batch(missing, batch_size)
     
-    return await _embedding_provider.encode_batch(texts, batch_size)
+    return await _embedding_cache.get_or_encode(_cache_namespace(provider), texts, encode)
 
 
 async def initialize_embeddings():
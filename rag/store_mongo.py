@@ -1,10 +1,162 @@
+import asyncio
+import os
+import re
+import time
 from typing import List, Dict, Any, Optional
 import numpy as np
+from bson.binary import Binary
 from core.models import Artifact, Embedding
-from rag.embed import get_embeddings
+from rag.embed import get_embeddings, get_query_embedding
 from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    faiss = None
+
+# Atlas Vector Search (HNSW) index on embeddings.embedding; see ensure_vector_index
+VECTOR_INDEX_NAME = os.getenv("MONGO_VECTOR_INDEX", "emb_idx")
+# ANN candidates examined per requested result
+VECTOR_NUM_CANDIDATES_FACTOR = 20
+
+# Seconds before the in-process search matrix is reloaded to pick up writes
+# made by other workers
+VECTOR_CACHE_TTL = float(os.getenv("VECTOR_CACHE_TTL", "300"))
+# Largest collection the search matrix is loaded for; above it each search
+# streams the collection and keeps only the top k (create the Atlas index)
+VECTOR_CACHE_MAX_DOCS = int(os.getenv("VECTOR_CACHE_MAX_DOCS", "200000"))
+# Documents scored per matrix-vector product when streaming
+VECTOR_STREAM_BLOCK = 1024
+
+# Embedding documents per insert_many call; keeps each command well under 16MB
+EMBEDDING_INSERT_BATCH = 500
+
+# Embeddings are spread over this many "bucket" values so the search matrix
+# can be loaded with one concurrent cursor per bucket
+VECTOR_SCAN_BUCKETS = 8
+
+# From this many cached embeddings, searches without a type filter probe a
+# FAISS IVF-PQ index over the matrix instead of scoring every row
+FAISS_MIN_VECTORS = int(os.getenv("FAISS_MIN_VECTORS", "50000"))
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "16"))
+# IVF-PQ candidates per requested result, re-scored exactly against the matrix
+FAISS_RERANK_FACTOR = 4
+
+# Store embeddings as int8 (per-vector max-abs scaling): 4x less data per
+# scan and ANN query. Cosine ignores the scale, so none is stored; switching
+# an existing collection requires re-embedding it
+VECTOR_STORAGE_INT8 = os.getenv("VECTOR_STORAGE_INT8", "0") == "1"
+
+# BSON binData subtype 9 ("vector") headers: dtype byte, then padding byte
+_VECTOR_SUBTYPE = 9
+_FLOAT32_HEADER = b"\x27\x00"
+_INT8_HEADER = b"\x03\x00"
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so cosine similarity reduces to a dot product"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+
+
+def _pack_vector(vector: np.ndarray) -> Binary:
+    """Encode as a BSON float32 vector: 4 bytes per dimension instead of a double array"""
+    if VECTOR_STORAGE_INT8:
+        return _pack_vector_int8(vector)
+    return Binary(_FLOAT32_HEADER + np.asarray(vector, dtype="<f4").tobytes(), _VECTOR_SUBTYPE)
+
+
+def _pack_vector_int8(vector: np.ndarray) -> Binary:
+    """Encode as a BSON int8 vector scaled so the largest component maps to +/-127"""
+    vector = np.asarray(vector, dtype=np.float32)
+    scale = max(float(np.abs(vector).max(initial=0.0)), 1e-12) / 127
+    quantized = np.round(vector / scale).astype(np.int8)
+    return Binary(_INT8_HEADER + quantized.tobytes(), _VECTOR_SUBTYPE)
+
+
+def _unpack_vector(value: Any) -> np.ndarray:
+    """Decode a stored embedding, accepting packed vectors and legacy float lists"""
+    if isinstance(value, (bytes, bytearray)):
+        if value[:1] == _INT8_HEADER[:1]:
+            # Unit length again, since the quantization scale is not stored
+            vector = np.frombuffer(value, dtype=np.int8, offset=len(_INT8_HEADER)).astype(np.float32)
+            return vector / max(float(np.linalg.norm(vector)), 1e-12)
+        return np.frombuffer(value, dtype="<f4", offset=len(_FLOAT32_HEADER))
+    return np.asarray(value, dtype=np.float32)
+
+
+def _substring_matcher(term: Optional[str]):
+    """Case-insensitive substring test for term, or None when there is no term"""
+    if term is None:
+        return None
+    return re.compile(re.escape(term), re.IGNORECASE).search
+
+
+def vector_index_definition(num_dimensions: int) -> Dict[str, Any]:
+    """Atlas vectorSearch index definition for the embeddings collection"""
+    return {
+        "fields": [
+            {
+                "type": "vector",
+                "path": "embedding",
+                "numDimensions": num_dimensions,
+                "similarity": "cosine",
+            },
+            # Lets $vectorSearch pre-filter by artifact type inside the ANN stage
+            {"type": "filter", "path": "artifact_type"},
+        ]
+    }
+
+
+async def ensure_vector_index(database: AsyncIOMotorDatabase, num_dimensions: int) -> bool:
+    """Create the Atlas vector index if missing; returns False on non-Atlas deployments"""
+    try:
+        existing = await database.embeddings.aggregate(
+            [{"$listSearchIndexes": {"name": VECTOR_INDEX_NAME}}]
+        ).to_list(length=1)
+        definition = vector_index_definition(num_dimensions)
+        if not existing:
+            await database.command({
+                "createSearchIndexes": "embeddings",
+                "indexes": [{
+                    "name": VECTOR_INDEX_NAME,
+                    "type": "vectorSearch",
+                    "definition": definition,
+                }],
+            })
+        elif existing[0].get("latestDefinition") != definition:
+            await database.command({
+                "updateSearchIndex": "embeddings",
+                "name": VECTOR_INDEX_NAME,
+                "definition": definition,
+            })
+        return True
+    except OperationFailure as e:
+        print(f"Atlas Vector Search not available, using client-side scoring: {e}")
+        return False
+
+
+async def backfill_artifact_fields(database: AsyncIOMotorDatabase) -> None:
+    """Copy artifact type/meta onto embeddings written before they were denormalized"""
+    await database.embeddings.aggregate([
+        {"$match": {"artifact_type": {"$exists": False}}},
+        {
+            "$lookup": {
+                "from": "artifacts",
+                "localField": "artifact_id",
+                "foreignField": "_id",
+                "as": "artifact"
+            }
+        },
+        {"$unwind": "$artifact"},
+        {"$project": {"artifact_type": "$artifact.type", "artifact_meta": "$artifact.meta"}},
+        {"$merge": {"into": "embeddings", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}},
+    ]).to_list(length=None)
+
 
 class MongoVectorStore:
     """MongoDB vector store for embeddings"""
@@ -13,6 +165,19 @@ class MongoVectorStore:
         self.db = database
         self.embeddings_collection: Collection = database.embeddings
         self.artifacts_collection: Collection = database.artifacts
+        # None until the first search finds the Atlas vector index (or finds it missing)
+        self._vector_search_available: Optional[bool] = None
+        # Client-side search matrix (unit rows) mirroring the embeddings collection
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._artifact_ids: Optional[np.ndarray] = None
+        self._artifact_types: Optional[np.ndarray] = None
+        self._matrix_loaded_at = 0.0
+        # One load at a time; concurrent searches wait for it instead of each reloading
+        self._matrix_lock = asyncio.Lock()
+        # Approximate index over the rows of _matrix (row number = FAISS id)
+        self._ann_index = None
     
     async def add_embeddings(
         self, 
@@ -25,23 +190,46 @@ class MongoVectorStore:
         # Split text into chunks
         chunks = self._split_text_into_chunks(texts, chunk_size, overlap)
         
-        # Generate embeddings for chunks
-        embeddings = await get_embeddings(chunks)
+        # Generate embeddings for chunks; stored unit-length so search is a dot product
+        embeddings = _normalize_rows(await get_embeddings(chunks))
+        
+        # Artifact type/meta ride along on every chunk so searches never join
+        artifact = await self.artifacts_collection.find_one({"_id": artifact_id}, {"type": 1, "meta": 1}) or {}
+        artifact_type = artifact.get("type")
+        artifact_meta = artifact.get("meta")
         
-        # Store embeddings in database
+        # Store embeddings in database; every field is built here, so skip
+        # pydantic validation on this per-chunk hot path
         embedding_docs = []
         for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            embedding_doc = Embedding(
+            embedding_doc = Embedding.model_construct(
                 artifact_id=artifact_id,
                 chunk_idx=i,
                 content=chunk,
-                embedding=embedding.tolist()
+                embedding=_pack_vector(embedding),
+                artifact_type=artifact_type,
+                artifact_meta=artifact_meta,
+                bucket=i % VECTOR_SCAN_BUCKETS
             )
             embedding_docs.append(embedding_doc.dict(by_alias=True))
         
-        # Insert all embeddings
-        result = await self.embeddings_collection.insert_many(embedding_docs)
-        return [str(doc_id) for doc_id in result.inserted_ids]
+        # Insert in unordered sub-batches issued concurrently
+        results = await asyncio.gather(*(
+            self.embeddings_collection.insert_many(
+                embedding_docs[start:start + EMBEDDING_INSERT_BATCH], ordered=False
+            )
+            for start in range(0, len(embedding_docs), EMBEDDING_INSERT_BATCH)
+        ))
+        inserted_ids = [str(doc_id) for result in results for doc_id in result.inserted_ids]
+        
+        if self._matrix is not None:
+            self._append_rows(
+                inserted_ids,
+                [artifact_id] * len(inserted_ids),
+                [artifact_type] * len(inserted_ids),
+                embeddings.astype(np.float32)
+            )
+        return inserted_ids
     
     def _split_text_into_chunks(
         self, 
@@ -50,20 +238,18 @@ class MongoVectorStore:
         overlap: int
     ) -> List[str]:
         """Split text into overlapping chunks"""
-        chunks = []
+        step = chunk_size - overlap
+        if step <= 0:
+            raise ValueError("overlap must be smaller than chunk_size")
         
+        chunks = []
         for text in texts:
             if len(text) <= chunk_size:
                 chunks.append(text)
                 continue
             
-            # Split into overlapping chunks
-            start = 0
-            while start < len(text):
-                end = start + chunk_size
-                chunk = text[start:end]
-                chunks.append(chunk)
-                start = end - overlap
+            # Chunk starts are fixed by the stride, so slice them in one pass
+            chunks.extend(text[start:start + chunk_size] for start in range(0, len(text), step))
         
         return chunks
     
@@ -75,109 +261,13 @@ class MongoVectorStore:
         threshold: float = 0.7
     ) -> List[Dict[str, Any]]:
         """Search for similar content using vector similarity"""
-        # Generate query embedding
-        query_embedding = await get_embeddings([query])
-        query_vector = query_embedding[0].tolist()
-        
-        # Build aggregation pipeline
-        pipeline = []
-        
-        # Join with artifacts collection
-        pipeline.append({
-            "$lookup": {
-                "from": "artifacts",
-                "localField": "artifact_id",
-                "foreignField": "_id",
-                "as": "artifact"
-            }
-        })
-        
-        pipeline.append({"$unwind": "$artifact"})
-        
-        # Filter by artifact types if specified
-        if artifact_types:
-            pipeline.append({
-                "$match": {"artifact.type": {"$in": artifact_types}}
-            })
-        
-        # Add vector similarity calculation (cosine similarity)
-        pipeline.append({
-            "$addFields": {
-                "similarity": {
-                    "$let": {
-                        "vars": {
-                            "dotProduct": {
-                                "$reduce": {
-                                    "input": {"$range": [0, {"$size": "$embedding"}]},
-                                    "initialValue": 0,
-                                    "in": {
-                                        "$add": [
-                                            "$$value",
-                                            {"$multiply": [
-                                                {"$arrayElemAt": ["$embedding", "$$this"]},
-                                                {"$arrayElemAt": [query_vector, "$$this"]}
-                                            ]}
-                                        ]
-                                    }
-                                }
-                            },
-                            "magnitude1": {
-                                "$sqrt": {
-                                    "$reduce": {
-                                        "input": "$embedding",
-                                        "initialValue": 0,
-                                        "in": {"$add": ["$$value", {"$multiply": ["$$this", "$$this"]}]}
-                                    }
-                                }
-                            },
-                            "magnitude2": {
-                                "$sqrt": {
-                                    "$reduce": {
-                                        "input": query_vector,
-                                        "initialValue": 0,
-                                        "in": {"$add": ["$$value", {"$multiply": ["$$this", "$$this"]}]}
-                                    }
-                                }
-                            }
-                        },
-                        "in": {
-                            "$divide": [
-                                "$$dotProduct",
-                                {"$multiply": ["$$magnitude1", "$$magnitude2"]}
-                            ]
-                        }
-                    }
-                }
-            }
-        })
-        
-        # Filter by threshold
-        pipeline.append({
-            "$match": {"similarity": {"$gte": threshold}}
-        })
+        # Generate query embedding (batched with concurrent searches)
+        query_embedding = await get_query_embedding(query)
+        query_vector = _normalize_rows(query_embedding)[0]
         
-        # Sort by similarity and limit
-        pipeline.append({"$sort": {"similarity": -1}})
-        pipeline.append({"$limit": k})
-        
-        # Project final fields
-        pipeline.append({
-            "$project": {
-                "id": "$_id",
-                "artifact_id": 1,
-                "chunk_idx": 1,
-                "content": 1,
-                "artifact_type": "$artifact.type",
-                "artifact_meta": "$artifact.meta",
-                "similarity": 1
-            }
-        })
-        
-        # Execute aggregation
-        cursor = self.embeddings_collection.aggregate(pipeline)
-        results = await cursor.to_list(length=k)
-        
-        return results
+        return await self._search(
+            query_vector, k, threshold, artifact_types=artifact_types, include_meta=True
+        )
     
     async def find_similar_chunks(
         self, 
@@ -191,89 +281,330 @@ class MongoVectorStore:
         if not target_chunk:
             return []
         
-        target_embedding = target_chunk["embedding"]
+        target_vector = _normalize_rows(_unpack_vector(target_chunk["embedding"]))[0]
+        return await self._search(
+            target_vector, k, threshold, exclude_id=chunk_id, include_meta=False
+        )
+    
+    async def _search(
+        self,
+        vector: np.ndarray,
+        k: int,
+        threshold: float,
+        artifact_types: Optional[List[str]] = None,
+        exclude_id: Optional[str] = None,
+        include_meta: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Top-k chunks by cosine similarity, via Atlas $vectorSearch when available"""
+        if self._vector_search_available is None:
+            # Decided once the index is known to exist (or not); stays None while it builds
+            self._vector_search_available = await self._vector_index_ready()
+        if self._vector_search_available:
+            pipeline = self._vector_search_pipeline(vector, k, threshold, artifact_types, exclude_id, include_meta)
+            return await self.embeddings_collection.aggregate(pipeline).to_list(length=k)
+        
+        return await self._scan_search(vector, k, threshold, artifact_types, exclude_id, include_meta)
+    
+    async def _vector_index_ready(self) -> Optional[bool]:
+        """True if the Atlas vector index is queryable, None while it builds, else False"""
+        # $vectorSearch against a missing index returns no documents instead of
+        # raising, so the index itself is checked before the Atlas path is trusted
+        try:
+            indexes = await self.embeddings_collection.aggregate(
+                [{"$listSearchIndexes": {"name": VECTOR_INDEX_NAME}}]
+            ).to_list(length=1)
+        except OperationFailure as e:
+            print(f"Atlas Vector Search not available, using client-side scoring: {e}")
+            return False
+        if not indexes:
+            print(f"Vector index '{VECTOR_INDEX_NAME}' not found (run scripts/init_mongo.py), using client-side scoring")
+            return False
+        return True if indexes[0].get("queryable", True) else None
+    
+    def _vector_search_pipeline(
+        self,
+        vector: np.ndarray,
+        k: int,
+        threshold: float,
+        artifact_types: Optional[List[str]],
+        exclude_id: Optional[str],
+        include_meta: bool
+    ) -> List[Dict[str, Any]]:
+        """ANN retrieval with the artifact type filter applied inside the index scan"""
+        vector_search: Dict[str, Any] = {
+            "index": VECTOR_INDEX_NAME,
+            "path": "embedding",
+            # Query with the same element type the index was built on
+            "queryVector": _pack_vector_int8(vector) if VECTOR_STORAGE_INT8 else vector.tolist(),
+            "numCandidates": k * VECTOR_NUM_CANDIDATES_FACTOR,
+            # Self-exclusion runs after the ANN stage, so fetch one spare
+            "limit": k + (1 if exclude_id else 0),
+        }
+        if artifact_types:
+            vector_search["filter"] = {"artifact_type": {"$in": artifact_types}}
         
-        # Build aggregation pipeline similar to similarity_search
-        pipeline = [
-            {"$match": {"_id": {"$ne": chunk_id}}},
-            {
-                "$lookup": {
-                    "from": "artifacts",
-                    "localField": "artifact_id",
-                    "foreignField": "_id",
-                    "as": "artifact"
-                }
-            },
-            {"$unwind": "$artifact"},
+        pipeline: List[Dict[str, Any]] = [
+            {"$vectorSearch": vector_search},
+            # vectorSearchScore for cosine is (1 + cos) / 2; report plain cosine
             {
                 "$addFields": {
                     "similarity": {
-                        "$let": {
-                            "vars": {
-                                "dotProduct": {
-                                    "$reduce": {
-                                        "input": {"$range": [0, {"$size": "$embedding"}]},
-                                        "initialValue": 0,
-                                        "in": {
-                                            "$add": [
-                                                "$$value",
-                                                {"$multiply": [
-                                                    {"$arrayElemAt": ["$embedding", "$$this"]},
-                                                    {"$arrayElemAt": [target_embedding, "$$this"]}
-                                                ]}
-                                            ]
-                                        }
-                                    }
-                                },
-                                "magnitude1": {
-                                    "$sqrt": {
-                                        "$reduce": {
-                                            "input": "$embedding",
-                                            "initialValue": 0,
-                                            "in": {"$add": ["$$value", {"$multiply": ["$$this", "$$this"]}]}
-                                        }
-                                    }
-                                },
-                                "magnitude2": {
-                                    "$sqrt": {
-                                        "$reduce": {
-                                            "input": target_embedding,
-                                            "initialValue": 0,
-                                            "in": {"$add": ["$$value", {"$multiply": ["$$this", "$$this"]}]}
-                                        }
-                                    }
-                                }
-                            },
-                            "in": {
-                                "$divide": [
-                                    "$$dotProduct",
-                                    {"$multiply": ["$$magnitude1", "$$magnitude2"]}
-                                ]
-                            }
-                        }
+                        "$subtract": [{"$multiply": [2, {"$meta": "vectorSearchScore"}]}, 1]
                     }
                 }
             },
-            {"$match": {"similarity": {"$gte": threshold}}},
-            {"$sort": {"similarity": -1}},
-            {"$limit": k},
-            {
-                "$project": {
-                    "id": "$_id",
-                    "artifact_id": 1,
-                    "chunk_idx": 1,
-                    "content": 1,
-                    "artifact_type": "$artifact.type",
-                    "similarity": 1
-                }
-            }
         ]
+        if exclude_id is not None:
+            pipeline.append({"$match": {"_id": {"$ne": exclude_id}}})
+        pipeline.append({"$match": {"similarity": {"$gte": threshold}}})
+        pipeline.append({"$limit": k})
+        pipeline.append(self._project_stage(include_meta))
+        return pipeline
+    
+    async def _scan_search(
+        self,
+        vector: np.ndarray,
+        k: int,
+        threshold: float,
+        artifact_types: Optional[List[str]],
+        exclude_id: Optional[str],
+        include_meta: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Brute-force fallback: score every embedding with one BLAS matrix-vector
+        product against the cached matrix (the server cannot do arithmetic on
+        packed vectors). Large unfiltered searches only score the candidates
+        returned by the FAISS index; collections too large to cache are
+        streamed instead.
+        """
+        if not await self._ensure_matrix():
+            return await self._stream_search(vector, k, threshold, artifact_types, exclude_id, include_meta)
+        if not self._ids:
+            return []
         
-        cursor = self.embeddings_collection.aggregate(pipeline)
-        results = await cursor.to_list(length=k)
+        query = vector.astype(np.float32)
+        if not artifact_types and await self._ensure_ann_index():
+            rows = self._ann_candidates(query, (k + 1) * FAISS_RERANK_FACTOR)
+            if exclude_id in self._row_of:
+                rows = rows[rows != self._row_of[exclude_id]]
+            scores = self._matrix[rows] @ query
+            top = self._top_k(scores, k, threshold)
+            return await self._hydrate([self._ids[rows[i]] for i in top], scores[top], include_meta)
+        
+        scores = self._matrix @ query
+        if artifact_types:
+            scores[~np.isin(self._artifact_types, artifact_types)] = -np.inf
+        if exclude_id in self._row_of:
+            scores[self._row_of[exclude_id]] = -np.inf
         
+        top = self._top_k(scores, k, threshold)
+        return await self._hydrate([self._ids[i] for i in top], scores[top], include_meta)
+    
+    def _matrix_fresh(self) -> bool:
+        """Matrix loaded within the last VECTOR_CACHE_TTL seconds"""
+        return self._matrix is not None and time.monotonic() - self._matrix_loaded_at < VECTOR_CACHE_TTL
+    
+    async def _ensure_matrix(self) -> bool:
+        """
+        Load all embeddings into one float32 matrix, reading the buckets
+        concurrently. False when the collection exceeds VECTOR_CACHE_MAX_DOCS.
+        """
+        if self._matrix_fresh():
+            return True
+        async with self._matrix_lock:
+            if self._matrix_fresh():
+                return True
+            if await self.embeddings_collection.estimated_document_count() > VECTOR_CACHE_MAX_DOCS:
+                self._matrix, self._ids, self._row_of, self._ann_index = None, [], {}, None
+                self._matrix_loaded_at = 0.0
+                return False
+            await self._load_matrix()
+            return True
+    
+    async def _load_matrix(self) -> None:
+        """Replace the search matrix with the current contents of the collection"""
+        # Documents written before bucketing are picked up by the last query
+        queries = [{"bucket": bucket} for bucket in range(VECTOR_SCAN_BUCKETS)]
+        queries.append({"bucket": {"$exists": False}})
+        parts = await asyncio.gather(*(self._load_bucket(query) for query in queries))
+        
+        ids = [doc_id for part in parts for doc_id in part[0]]
+        artifact_ids = [artifact_id for part in parts for artifact_id in part[1]]
+        artifact_types = [artifact_type for part in parts for artifact_type in part[2]]
+        rows = [row for part in parts for row in part[3]]
+        
+        self._matrix = np.vstack(rows).astype(np.float32, copy=False) if rows else np.empty((0, 0), dtype=np.float32)
+        self._ids = ids
+        self._row_of = {doc_id: i for i, doc_id in enumerate(ids)}
+        self._artifact_ids = np.array(artifact_ids, dtype=object)
+        self._artifact_types = np.array(artifact_types, dtype=object)
+        self._matrix_loaded_at = time.monotonic()
+        self._ann_index = None
+    
+    async def _stream_search(
+        self,
+        vector: np.ndarray,
+        k: int,
+        threshold: float,
+        artifact_types: Optional[List[str]],
+        exclude_id: Optional[str],
+        include_meta: bool
+    ) -> List[Dict[str, Any]]:
+        """Scan without the cached matrix: score each bucket as it streams, keeping its top k"""
+        match: Dict[str, Any] = {}
+        if artifact_types:
+            match["artifact_type"] = {"$in": artifact_types}
+        if exclude_id is not None:
+            match["_id"] = {"$ne": exclude_id}
+        queries = [{**match, "bucket": bucket} for bucket in range(VECTOR_SCAN_BUCKETS)]
+        queries.append({**match, "bucket": {"$exists": False}})
+        query = vector.astype(np.float32)
+        parts = await asyncio.gather(*(self._stream_bucket(q, query, k, threshold) for q in queries))
+        
+        ids = [doc_id for part in parts for doc_id in part[0]]
+        scores = np.concatenate([part[1] for part in parts])
+        top = self._top_k(scores, k, threshold)
+        return await self._hydrate([ids[i] for i in top], scores[top], include_meta)
+    
+    async def _stream_bucket(self, query: Dict[str, Any], vector: np.ndarray, k: int, threshold: float):
+        """Top-k ids and scores of the embeddings matching query, scored in blocks"""
+        best_ids: List[str] = []
+        best_scores = np.empty(0, dtype=np.float32)
+        ids, rows = [], []
+        
+        def keep_top() -> None:
+            nonlocal best_ids, best_scores
+            scores = np.concatenate([best_scores, np.vstack(rows) @ vector])
+            candidates = best_ids + ids
+            top = self._top_k(scores, k, threshold)
+            best_ids, best_scores = [candidates[i] for i in top], scores[top]
+        
+        async for doc in self.embeddings_collection.find(query, {"embedding": 1}):
+            ids.append(doc["_id"])
+            rows.append(_unpack_vector(doc["embedding"]))
+            if len(ids) == VECTOR_STREAM_BLOCK:
+                keep_top()
+                ids, rows = [], []
+        if ids:
+            keep_top()
+        return best_ids, best_scores
+    
+    async def _ensure_ann_index(self) -> bool:
+        """Build the FAISS index once the matrix is large enough; False means brute force"""
+        if self._ann_index is not None:
+            return True
+        if not FAISS_AVAILABLE or len(self._ids) < FAISS_MIN_VECTORS:
+            return False
+        
+        loaded_at, built_rows = self._matrix_loaded_at, len(self._ids)
+        index = await asyncio.to_thread(self._build_ann_index, self._matrix)
+        if self._matrix_loaded_at != loaded_at:
+            # Matrix was reloaded while training; score this query exactly
+            return False
+        if len(self._ids) > built_rows:
+            # Rows appended while training
+            index.add(np.ascontiguousarray(self._matrix[built_rows:]))
+        self._ann_index = index
+        return True
+    
+    @staticmethod
+    def _build_ann_index(matrix: np.ndarray):
+        """Train and fill an inner-product IVF-PQ index over the (unit) rows"""
+        n, dim = matrix.shape
+        nlist = min(1024, int(4 * np.sqrt(n)))
+        # Largest sub-quantizer count <= 48 that divides the dimension
+        m = max(m for m in range(1, 49) if dim % m == 0)
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+        
+        sample_size = min(n, max(40 * nlist, 10000))
+        sample = matrix[np.random.default_rng(0).choice(n, sample_size, replace=False)]
+        index.train(np.ascontiguousarray(sample))
+        index.add(np.ascontiguousarray(matrix))
+        index.nprobe = FAISS_NPROBE
+        return index
+    
+    def _ann_candidates(self, query: np.ndarray, count: int) -> np.ndarray:
+        """Matrix rows of the approximate nearest neighbours of query"""
+        _, rows = self._ann_index.search(query[None, :], count)
+        rows = rows[0]
+        return rows[rows >= 0]
+    
+    async def _load_bucket(self, query: Dict[str, Any]):
+        """Ids, artifact ids, artifact types and vectors of the embeddings matching query"""
+        ids, artifact_ids, artifact_types, rows = [], [], [], []
+        projection = {"embedding": 1, "artifact_id": 1, "artifact_type": 1}
+        async for doc in self.embeddings_collection.find(query, projection):
+            ids.append(doc["_id"])
+            artifact_ids.append(doc["artifact_id"])
+            artifact_types.append(doc.get("artifact_type"))
+            rows.append(_unpack_vector(doc["embedding"]))
+        return ids, artifact_ids, artifact_types, rows
+    
+    def _append_rows(
+        self,
+        ids: List[str],
+        artifact_ids: List[str],
+        artifact_types: List[Optional[str]],
+        rows: np.ndarray
+    ) -> None:
+        """Keep a loaded matrix in sync with embeddings this store just wrote"""
+        if self._matrix.size == 0:
+            self._matrix = rows
+        else:
+            self._matrix = np.vstack([self._matrix, rows])
+        self._row_of.update((doc_id, len(self._ids) + i) for i, doc_id in enumerate(ids))
+        self._ids.extend(ids)
+        self._artifact_ids = np.concatenate([self._artifact_ids, np.array(artifact_ids, dtype=object)])
+        self._artifact_types = np.concatenate([self._artifact_types, np.array(artifact_types, dtype=object)])
+        if self._ann_index is not None:
+            self._ann_index.add(np.ascontiguousarray(rows, dtype=np.float32))
+    
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int, threshold: float) -> np.ndarray:
+        """Indices of the k best scores at or above threshold, best first"""
+        candidates = np.flatnonzero(scores >= threshold)
+        if k <= 0:
+            return candidates[:0]
+        if candidates.size > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+    
+    async def _hydrate(
+        self,
+        ids: List[str],
+        scores: np.ndarray,
+        include_meta: bool
+    ) -> List[Dict[str, Any]]:
+        """Load result payloads for scored ids, preserving score order"""
+        if not ids:
+            return []
+        pipeline = [{"$match": {"_id": {"$in": ids}}}, self._project_stage(include_meta)]
+        docs = await self.embeddings_collection.aggregate(pipeline).to_list(length=len(ids))
+        by_id = {doc["_id"]: doc for doc in docs}
+        
+        results = []
+        for doc_id, score in zip(ids, scores.tolist()):
+            doc = by_id.get(doc_id)
+            if doc is not None:
+                doc["similarity"] = score
+                results.append(doc)
         return results
     
+    def _project_stage(self, include_meta: bool) -> Dict[str, Any]:
+        """Final result shape shared by both search paths"""
+        projection = {
+            "id": "$_id",
+            "artifact_id": 1,
+            "chunk_idx": 1,
+            "content": 1,
+            "artifact_type": 1,
+            "similarity": 1
+        }
+        if include_meta:
+            projection["artifact_meta"] = 1
+        return {"$project": projection}
+    
     async def semantic_search(
         self, 
         query: str, 
@@ -317,39 +648,45 @@ class MongoVectorStore:
         context: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """Re-rank results based on context relevance"""
-        for result in results:
-            # Simple context scoring
-            context_score = 0
+        # Compile case-insensitive matchers once per request; searching with
+        # them avoids lowercasing a copy of every result's content
+        role = _substring_matcher(context.get("role"))
+        industry = _substring_matcher(context.get("industry"))
+        competency = _substring_matcher(context.get("competency"))
+        
+        context_scores = np.zeros(len(results))
+        for i, result in enumerate(results):
+            meta = result.get("artifact_meta")
+            if not meta:
+                continue
+            
+            # Check for role relevance
+            if role is not None and "role" in meta and role(meta["role"]):
+                context_scores[i] += 0.3
             
-            if "artifact_meta" in result and result["artifact_meta"]:
-                meta = result["artifact_meta"]
-                
-                # Check for role relevance
-                if "role" in context and "role" in meta:
-                    if context["role"].lower() in meta["role"].lower():
-                        context_score += 0.3
-                
-                # Check for industry relevance
-                if "industry" in context and "industry" in meta:
-                    if context["industry"].lower() in meta["industry"].lower():
-                        context_score += 0.2
-                
-                # Check for competency relevance
-                if "competency" in context:
-                    content_lower = result["content"].lower()
-                    if context["competency"].lower() in content_lower:
-                        context_score += 0.5
+            # Check for industry relevance
+            if industry is not None and "industry" in meta and industry(meta["industry"]):
+                context_scores[i] += 0.2
             
-            # Combine similarity and context scores
-            result["final_score"] = (0.7 * result["similarity"]) + (0.3 * context_score)
+            # Check for competency relevance
+            if competency is not None and competency(result["content"]):
+                context_scores[i] += 0.5
+        
+        # Combine similarity and context scores
+        similarities = np.array([result["similarity"] for result in results], dtype=np.float64)
+        final_scores = 0.7 * similarities + 0.3 * context_scores
+        for result, final_score in zip(results, final_scores.tolist()):
+            result["final_score"] = final_score
         
         # Sort by final score
-        results.sort(key=lambda x: x["final_score"], reverse=True)
-        return results
+        order = np.argsort(-final_scores, kind="stable")
+        return [results[i] for i in order]
     
     async def delete_artifact_embeddings(self, artifact_id: str) -> int:
         """Delete all embeddings for an artifact"""
         result = await self.embeddings_collection.delete_many({"artifact_id": artifact_id})
+        # Rows cannot be dropped cheaply; reload on the next scan
+        self._matrix = None
         return result.deleted_count
     
     async def get_embedding_stats(self) -> Dict[str, Any]:
@@ -359,18 +696,9 @@ class MongoVectorStore:
         
         # Get embeddings by artifact type
         pipeline = [
-            {
-                "$lookup": {
-                    "from": "artifacts",
-                    "localField": "artifact_id",
-                    "foreignField": "_id",
-                    "as": "artifact"
-                }
-            },
-            {"$unwind": "$artifact"},
             {
                 "$group": {
-                    "_id": "$artifact.type",
+                    "_id": "$artifact_type",
                     "count": {"$sum": 1}
                 }
             }
@@ -389,6 +717,12 @@ class MongoVectorStore:
 
 
 # Factory function
+_vector_stores: Dict[str, MongoVectorStore] = {}
+
+
 async def get_vector_store(database: AsyncIOMotorDatabase) -> MongoVectorStore:
-    """Get a vector store instance"""
-    return MongoVectorStore(database)
\ No newline at end of file
+    """Get the vector store for a database (shared, so its search matrix is reused)"""
+    store = _vector_stores.get(database.name)
+    if store is None or store.db is not database:
+        store = _vector_stores[database.name] = MongoVectorStore(database)
+    return store
\ No newline at end of file
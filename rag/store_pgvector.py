@@ -1,10 +1,200 @@
-from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import os
+import uuid
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
 import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.dialects.postgresql import JSONB
 from core.db import get_db
-from core.models import Artifact, Embedding
-from rag.embed import get_embeddings
+from rag.embed import get_embeddings, get_query_embedding
+
+try:
+    from pgvector.psycopg2 import register_vector
+    PGVECTOR_AVAILABLE = True
+except ImportError:
+    PGVECTOR_AVAILABLE = False
+    register_vector = None
+
+try:
+    from psycopg2.extras import Json, execute_values
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+    Json = execute_values = None
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels run as plain NumPy code without numba"""
+        def decorator(func):
+            return func
+        return decorator
+
+# HNSW candidate list size per query (pgvector default 40); higher = better recall
+HNSW_EF_SEARCH = int(os.getenv("PGVECTOR_EF_SEARCH", "64"))
+# halfvec candidates fetched per requested result before the float32 rerank
+RERANK_MULTIPLIER = int(os.getenv("PGVECTOR_RERANK_MULTIPLIER", "4"))
+# Result count from which reranking uses the compiled kernel (JIT warmup
+# is not worth it for a handful of results)
+RERANK_JIT_MIN_RESULTS = 256
+
+# Context score weights for role, industry and competency matches
+_CONTEXT_WEIGHTS = np.array([0.3, 0.2, 0.5])
+
+
+# Statements are built once at import and reused, so each call skips
+# rebuilding and re-parsing the SQL text.
+# Similarity search: the HNSW index over the halfvec column picks candidates,
+# which are then reranked by exact float32 distance. Vectors are stored
+# unit-length, so the negative inner product <#> orders like cosine distance
+# without computing norms
+_SIMILARITY_SEARCH_TEMPLATE = """
+    WITH candidates AS (
+        SELECT e.id
+        FROM embeddings e
+        {type_filter}
+        ORDER BY e.embedding_half <#> CAST(:query_vector AS halfvec)
+        LIMIT :candidates
+    )
+    SELECT *
+    FROM (
+        SELECT 
+            e.id,
+            e.artifact_id,
+            e.chunk_idx,
+            e.content,
+            e.artifact_type,
+            e.artifact_meta,
+            e.embedding <#> CAST(:query_vector AS vector) as distance
+        FROM candidates c
+        JOIN embeddings e ON e.id = c.id
+        OFFSET 0  -- keeps the subquery from being flattened into the outer filter
+    ) scored
+    WHERE distance <= :max_distance
+    ORDER BY distance
+    LIMIT :k
+"""
+_SIMILARITY_SEARCH_SQL = text(_SIMILARITY_SEARCH_TEMPLATE.format(type_filter=""))
+_SIMILARITY_SEARCH_BY_TYPE_SQL = text(
+    _SIMILARITY_SEARCH_TEMPLATE.format(type_filter="WHERE e.artifact_type = ANY(:artifact_types)")
+)
+
+# Neighbours of a stored chunk in one round trip: the target's vectors are read
+# server-side as scalar subqueries (constants to the planner, so HNSW still applies)
+_SIMILAR_CHUNKS_SQL = text("""
+    WITH target AS (
+        SELECT embedding, embedding_half FROM embeddings WHERE id = :chunk_id
+    ),
+    candidates AS (
+        SELECT e.id
+        FROM embeddings e
+        WHERE e.id != :chunk_id
+        ORDER BY e.embedding_half <#> (SELECT embedding_half FROM target)
+        LIMIT :candidates
+    )
+    SELECT *
+    FROM (
+        SELECT 
+            e.id,
+            e.artifact_id,
+            e.chunk_idx,
+            e.content,
+            e.artifact_type,
+            e.embedding <#> (SELECT embedding FROM target) as distance
+        FROM candidates c
+        JOIN embeddings e ON e.id = c.id
+        OFFSET 0  -- keeps the subquery from being flattened into the outer filter
+    ) scored
+    WHERE distance <= :max_distance
+    ORDER BY distance
+    LIMIT :k
+""")
+
+_INSERT_EMBEDDINGS_SQL = (
+    "INSERT INTO embeddings (id, artifact_id, chunk_idx, content, embedding, artifact_type, artifact_meta) "
+    "VALUES %s"
+)
+_INSERT_EMBEDDINGS_TEMPLATE = "(%(id)s, %(artifact_id)s, %(chunk_idx)s, %(content)s, %(embedding)s::vector, %(artifact_type)s, %(artifact_meta)s)"
+
+# Driver-agnostic form of the same INSERT, executed over a list of rows (executemany)
+_INSERT_EMBEDDING_SQL = text("""
+    INSERT INTO embeddings (id, artifact_id, chunk_idx, content, embedding, artifact_type, artifact_meta)
+    VALUES (:id, :artifact_id, :chunk_idx, :content, CAST(:embedding AS vector), :artifact_type, :artifact_meta)
+""").bindparams(bindparam("artifact_meta", type_=JSONB(none_as_null=True)))
+
+# Totals plus per-type embedding counts (types without embeddings count 0)
+_EMBEDDING_STATS_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM embeddings) AS total_embeddings,
+        (SELECT COUNT(*) FROM artifacts) AS total_artifacts,
+        (
+            SELECT json_object_agg(type, count)
+            FROM (
+                SELECT a.type, COUNT(e.id) as count
+                FROM artifacts a
+                LEFT JOIN embeddings e ON a.id = e.artifact_id
+                GROUP BY a.type
+            ) type_counts
+        ) AS embeddings_by_type
+""")
+
+_DELETE_ARTIFACT_EMBEDDINGS_SQL = text("DELETE FROM embeddings WHERE artifact_id = :artifact_id")
+
+_SET_EF_SEARCH_SQL = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+
+
+# Engines whose connections already get the pgvector numpy adapter
+_vector_engines = set()
+
+
+def _register_vector_adapter(db: Session) -> None:
+    """Let psycopg2 bind numpy arrays as vector parameters on db's engine"""
+    if not PGVECTOR_AVAILABLE:
+        return
+    engine = db.get_bind()
+    if engine in _vector_engines:
+        return
+    
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        register_vector(dbapi_connection)
+    
+    # Connections opened before the listener existed
+    register_vector(db.connection().connection.dbapi_connection)
+    _vector_engines.add(engine)
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row (float32, contiguous) so inner product equals cosine"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+    return np.ascontiguousarray(vectors / norms)
+
+
+def _vector_param(vector: np.ndarray):
+    """Vector bind parameter: the array itself with the pgvector adapter, else a list"""
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector if PGVECTOR_AVAILABLE else vector.tolist()
+
+
+@njit(parallel=True, cache=True)
+def _final_scores_kernel(similarities: np.ndarray, matches: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """0.7 * similarity + 0.3 * weighted context matches, one result per iteration"""
+    out = np.empty_like(similarities)
+    for i in prange(similarities.shape[0]):
+        context_score = 0.0
+        for j in range(weights.shape[0]):
+            if matches[i, j]:
+                context_score += weights[j]
+        out[i] = 0.7 * similarities[i] + 0.3 * context_score
+    return out
 
 
 class PGVectorStore:
@@ -12,116 +202,155 @@ class PGVectorStore:
     
     def __init__(self, db: Session):
         self.db = db
+        _register_vector_adapter(db)
     
     async def add_embeddings(
         self, 
         artifact_id: str, 
         texts: List[str], 
         chunk_size: int = 1000,
-        overlap: int = 200
+        overlap: int = 200,
+        batch_size: int = 500,
+        embed_batch: int = 64
     ) -> List[str]:
         """Add embeddings for an artifact's text chunks"""
-        # Split text into chunks
+        # Chunks are produced lazily and pulled one embedding batch at a time
         chunks = self._split_text_into_chunks(texts, chunk_size, overlap)
         
-        # Generate embeddings for chunks
-        embeddings = await get_embeddings(chunks)
+        # Artifact type/meta are copied onto every row so searches need no join
+        artifact = self.db.execute(
+            text("SELECT type, meta FROM artifacts WHERE id = :artifact_id"),
+            {"artifact_id": artifact_id}
+        ).first()
+        artifact_type = artifact.type if artifact else None
+        artifact_meta = artifact.meta if artifact else None
         
-        # Store embeddings in database
+        # Embed batch i + 1 while batch i is written (the write runs in a thread)
         embedding_ids = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            db_embedding = Embedding(
-                artifact_id=artifact_id,
-                chunk_idx=i,
-                content=chunk,
-                embedding=embedding.tolist()  # Convert numpy array to list for pgvector
-            )
-            
-            self.db.add(db_embedding)
-            embedding_ids.append(str(db_embedding.id))
+        batch = list(islice(chunks, embed_batch))
+        pending = asyncio.create_task(get_embeddings(batch)) if batch else None
+        start = 0
+        try:
+            while pending is not None:
+                # One contiguous unit-length float32 (n, d) block per batch; rows bind as views
+                embeddings = _normalize_rows(await pending)
+                current, batch = batch, list(islice(chunks, embed_batch))
+                pending = asyncio.create_task(get_embeddings(batch)) if batch else None
+                
+                # Build plain row mappings; ids are assigned here so they can be returned
+                rows = [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "artifact_id": artifact_id,
+                        "chunk_idx": start + i,
+                        "content": chunk,
+                        "embedding": _vector_param(embedding),
+                        "artifact_type": artifact_type,
+                        "artifact_meta": artifact_meta
+                    }
+                    for i, (chunk, embedding) in enumerate(zip(current, embeddings))
+                ]
+                await asyncio.to_thread(self._insert_rows, rows, batch_size)
+                embedding_ids.extend(row["id"] for row in rows)
+                start += len(current)
+        finally:
+            if pending is not None:
+                pending.cancel()
         
         self.db.commit()
         return embedding_ids
     
+    def _insert_rows(self, rows: List[Dict[str, Any]], batch_size: int) -> None:
+        """Multi-row INSERTs in bounded batches instead of one ORM add per chunk"""
+        if PSYCOPG2_AVAILABLE and self.db.get_bind().dialect.driver == "psycopg2":
+            # Straight to the driver: one INSERT ... VALUES statement per page
+            # None stays SQL NULL, as the executemany path writes it, not JSON null
+            values = [
+                dict(row, artifact_meta=Json(row["artifact_meta"]) if row["artifact_meta"] is not None else None)
+                for row in rows
+            ]
+            with self.db.connection().connection.cursor() as cursor:
+                execute_values(
+                    cursor,
+                    _INSERT_EMBEDDINGS_SQL,
+                    values,
+                    template=_INSERT_EMBEDDINGS_TEMPLATE,
+                    page_size=batch_size
+                )
+            return
+        
+        # Other drivers have no numpy adapter: bind vectors as plain lists
+        for start in range(0, len(rows), batch_size):
+            self.db.execute(_INSERT_EMBEDDING_SQL, [
+                dict(row, embedding=np.asarray(row["embedding"]).tolist())
+                for row in rows[start:start + batch_size]
+            ])
+    
     def _split_text_into_chunks(
         self, 
-        texts: List[str], 
+        texts: Iterable[str], 
         chunk_size: int, 
         overlap: int
-    ) -> List[str]:
-        """Split text into overlapping chunks"""
-        chunks = []
+    ) -> Iterator[str]:
+        """Lazily split text into overlapping chunks"""
+        step = chunk_size - overlap
+        if step <= 0:
+            raise ValueError("overlap must be smaller than chunk_size")
         
-        for text in texts:
-            if len(text) <= chunk_size:
-                chunks.append(text)
+        for doc in texts:
+            length = len(doc)
+            if length <= chunk_size:
+                yield doc
                 continue
             
-            # Split into overlapping chunks
-            start = 0
-            while start < len(text):
-                end = start + chunk_size
-                chunk = text[start:end]
-                chunks.append(chunk)
-                start = end - overlap
-        
-        return chunks
+            # Chunk starts are fixed by the stride
+            for start in range(0, length, step):
+                yield doc[start:start + chunk_size]
     
     async def similarity_search(
         self, 
-        query: str, 
+        query: Optional[str] = None, 
         k: int = 5, 
         artifact_types: Optional[List[str]] = None,
-        threshold: float = 0.7
+        threshold: float = 0.7,
+        rerank_multiplier: int = RERANK_MULTIPLIER,
+        query_vector: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar content using vector similarity"""
-        # Generate query embedding
-        query_embedding = await get_embeddings([query])
-        query_vector = query_embedding[0].tolist()
-        
-        # Build query
-        query_sql = """
-        SELECT 
-            e.id,
-            e.artifact_id,
-            e.chunk_idx,
-            e.content,
-            a.type as artifact_type,
-            a.meta as artifact_meta,
-            e.embedding <=> $1 as distance
-        FROM embeddings e
-        JOIN artifacts a ON e.artifact_id = a.id
-        """
-        
-        params = [query_vector]
+        """Search for similar content using vector similarity (pass query_vector to skip embedding)"""
+        if query_vector is None:
+            if query is None:
+                raise ValueError("Either query or query_vector is required")
+            # Generate query embedding (cached, and batched with concurrent searches)
+            query_vector = await get_query_embedding(query)
+        query_vector = _vector_param(_normalize_rows(query_vector)[0])
         
+        params = {
+            "query_vector": query_vector,
+            "candidates": k * rerank_multiplier,
+            "max_distance": -threshold,
+            "k": k
+        }
         if artifact_types:
-            query_sql += " WHERE a.type = ANY($2)"
-            params.append(artifact_types)
-        
-        query_sql += """
-        ORDER BY e.embedding <=> $1
-        LIMIT $3
-        """
-        params.append(k)
+            params["artifact_types"] = artifact_types
         
         # Execute query
-        result = self.db.execute(text(query_sql), params)
+        self._set_ef_search()
+        statement = _SIMILARITY_SEARCH_BY_TYPE_SQL if artifact_types else _SIMILARITY_SEARCH_SQL
+        result = self.db.execute(statement, params)
         rows = result.fetchall()
         
         # Process results
         results = []
         for row in rows:
-            if row.distance <= (1 - threshold):  # Convert similarity to distance
-                results.append({
-                    "id": row.id,
-                    "artifact_id": row.artifact_id,
-                    "chunk_idx": row.chunk_idx,
-                    "content": row.content,
-                    "artifact_type": row.artifact_type,
-                    "artifact_meta": row.artifact_meta,
-                    "similarity": 1 - row.distance
-                })
+            results.append({
+                "id": row.id,
+                "artifact_id": row.artifact_id,
+                "chunk_idx": row.chunk_idx,
+                "content": row.content,
+                "artifact_type": row.artifact_type,
+                "artifact_meta": row.artifact_meta,
+                "similarity": -row.distance
+            })
         
         return results
     
@@ -132,48 +361,36 @@ class PGVectorStore:
         threshold: float = 0.7
     ) -> List[Dict[str, Any]]:
         """Find chunks similar to a specific chunk"""
-        # Get the target chunk
-        target_chunk = self.db.query(Embedding).filter(Embedding.id == chunk_id).first()
-        if not target_chunk:
-            return []
-        
-        # Search for similar chunks
-        query_sql = """
-        SELECT 
-            e.id,
-            e.artifact_id,
-            e.chunk_idx,
-            e.content,
-            a.type as artifact_type,
-            e.embedding <=> $1 as distance
-        FROM embeddings e
-        JOIN artifacts a ON e.artifact_id = a.id
-        WHERE e.id != $2
-        ORDER BY e.embedding <=> $1
-        LIMIT $3
-        """
-        
+        self._set_ef_search()
         result = self.db.execute(
-            text(query_sql), 
-            [target_chunk.embedding, chunk_id, k]
+            _SIMILAR_CHUNKS_SQL, 
+            {
+                "chunk_id": chunk_id,
+                "candidates": k * RERANK_MULTIPLIER,
+                "max_distance": -threshold,
+                "k": k
+            }
         )
         rows = result.fetchall()
         
         # Process results
         results = []
         for row in rows:
-            if row.distance <= (1 - threshold):
-                results.append({
-                    "id": row.id,
-                    "artifact_id": row.artifact_id,
-                    "chunk_idx": row.chunk_idx,
-                    "content": row.content,
-                    "artifact_type": row.artifact_type,
-                    "similarity": 1 - row.distance
-                })
+            results.append({
+                "id": row.id,
+                "artifact_id": row.artifact_id,
+                "chunk_idx": row.chunk_idx,
+                "content": row.content,
+                "artifact_type": row.artifact_type,
+                "similarity": -row.distance
+            })
         
         return results
     
+    def _set_ef_search(self) -> None:
+        """Set the HNSW candidate list size for the current transaction"""
+        self.db.execute(_SET_EF_SEARCH_SQL, {"ef_search": str(HNSW_EF_SEARCH)})
+    
     async def semantic_search(
         self, 
         query: str, 
@@ -185,8 +402,9 @@ class PGVectorStore:
         context_text = self._build_context_text(context)
         enhanced_query = f"{query}\n\nContext: {context_text}"
         
-        # Perform similarity search
-        results = await self.similarity_search(enhanced_query, k)
+        # Embed the enhanced query once and search with the vector
+        query_vector = await get_query_embedding(enhanced_query)
+        results = await self.similarity_search(k=k, query_vector=query_vector)
         
         # Re-rank results based on context relevance
         ranked_results = self._rerank_by_context(results, context)
@@ -217,62 +435,58 @@ class PGVectorStore:
         context: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """Re-rank results based on context relevance"""
-        for result in results:
-            # Simple context scoring
-            context_score = 0
+        # Lowercase the context once rather than per result
+        role = context["role"].lower() if "role" in context else None
+        industry = context["industry"].lower() if "industry" in context else None
+        competency = context["competency"].lower() if "competency" in context else None
+        
+        # Role / industry / competency match per result
+        matches = np.zeros((len(results), 3), dtype=np.bool_)
+        for i, result in enumerate(results):
+            meta = result.get("artifact_meta")
+            if not meta:
+                continue
             
-            if "artifact_meta" in result and result["artifact_meta"]:
-                meta = result["artifact_meta"]
-                
-                # Check for role relevance
-                if "role" in context and "role" in meta:
-                    if context["role"].lower() in meta["role"].lower():
-                        context_score += 0.3
-                
-                # Check for industry relevance
-                if "industry" in context and "industry" in meta:
-                    if context["industry"].lower() in meta["industry"].lower():
-                        context_score += 0.2
-                
-                # Check for competency relevance
-                if "competency" in context:
-                    content_lower = result["content"].lower()
-                    if context["competency"].lower() in content_lower:
-                        context_score += 0.5
+            # Check for role relevance
+            matches[i, 0] = role is not None and "role" in meta and role in meta["role"].lower()
             
-            # Combine similarity and context scores
-            result["final_score"] = (0.7 * result["similarity"]) + (0.3 * context_score)
+            # Check for industry relevance
+            matches[i, 1] = industry is not None and "industry" in meta and industry in meta["industry"].lower()
+            
+            # Check for competency relevance
+            matches[i, 2] = competency is not None and competency in result["content"].lower()
         
-        # Sort by final score
-        results.sort(key=lambda x: x["final_score"], reverse=True)
-        return results
+        # Combine similarity and context scores
+        similarities = np.fromiter((result["similarity"] for result in results), dtype=np.float64, count=len(results))
+        if NUMBA_AVAILABLE and len(results) >= RERANK_JIT_MIN_RESULTS:
+            final_scores = _final_scores_kernel(similarities, matches, _CONTEXT_WEIGHTS)
+        else:
+            context_scores = np.where(matches, _CONTEXT_WEIGHTS, 0.0).sum(axis=1)
+            final_scores = 0.7 * similarities + 0.3 * context_scores
+        for result, final_score in zip(results, final_scores.tolist()):
+            result["final_score"] = final_score
+        
+        # Sort by final score (stable, like list.sort)
+        order = np.argsort(-final_scores, kind="stable")
+        return [results[i] for i in order]
     
     def delete_artifact_embeddings(self, artifact_id: str) -> int:
         """Delete all embeddings for an artifact"""
-        deleted_count = self.db.query(Embedding).filter(
-            Embedding.artifact_id == artifact_id
-        ).delete()
+        # Plain server-side DELETE; core.models.Embedding is a Beanie document, not a mapped table
+        result = self.db.execute(_DELETE_ARTIFACT_EMBEDDINGS_SQL, {"artifact_id": artifact_id})
         
         self.db.commit()
-        return deleted_count
+        return result.rowcount
     
     def get_embedding_stats(self) -> Dict[str, Any]:
         """Get statistics about stored embeddings"""
-        total_embeddings = self.db.query(Embedding).count()
-        total_artifacts = self.db.query(Artifact).count()
-        
-        # Get embeddings by artifact type
-        type_counts = self.db.execute(text("""
-            SELECT a.type, COUNT(e.id) as count
-            FROM artifacts a
-            LEFT JOIN embeddings e ON a.id = e.artifact_id
-            GROUP BY a.type
-        """)).fetchall()
+        # All three figures in one round trip
+        row = self.db.execute(_EMBEDDING_STATS_SQL).first()
         
         stats = {
-            "total_embeddings": total_embeddings,
-            "total_artifacts": total_artifacts,
-            "embeddings_by_type": {row.type: row.count for row in type_counts}
+            "total_embeddings": row.total_embeddings,
+            "total_artifacts": row.total_artifacts,
+            "embeddings_by_type": dict(row.embeddings_by_type or {})
         }
         
         return stats
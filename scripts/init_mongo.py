@@ -8,8 +8,19 @@ import asyncio
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from pymongo.errors import OperationFailure
 from core.models import User, Session, Artifact, Question, Answer, Score, Report, Embedding
 from core.config import settings
+from rag.embed import get_embedding_provider
+from rag.store_mongo import backfill_artifact_fields, ensure_vector_index
+
+# bcrypt hash of the demo password "demo123" (same constant as scripts/seed_demo.py)
+DEMO_PASSWORD_HASH = os.getenv(
+    "DEMO_PASSWORD_HASH", "$2b$12$bA1x55xtg53q30697zqt5.Guk9IGbznv/KP4xIV/AqIF5lMWN.Wh2"
+)
+
+# IndexOptionsConflict / IndexKeySpecsConflict: an equivalent index exists under other options
+INDEX_CONFLICT_CODES = (85, 86)
 
 
 async def create_indexes():
@@ -25,18 +36,34 @@ async def create_indexes():
         document_models=[User, Session, Artifact, Question, Answer, Score, Report, Embedding]
     )
     
-    # Create additional indexes
-    await db.users.create_index("email", unique=True)
-    await db.sessions.create_index([("user_id", 1), ("created_at", -1)])
-    await db.questions.create_index([("session_id", 1), ("order_index", 1)])
-    await db.answers.create_index([("session_id", 1), ("question_id", 1)])
-    await db.scores.create_index("answer_id")
-    await db.reports.create_index("session_id", unique=True)
-    await db.embeddings.create_index([("artifact_id", 1), ("chunk_idx", 1)])
+    # Create additional indexes concurrently; create_index is a no-op for an
+    # identical existing index, so the script can be re-run
+    results = await asyncio.gather(
+        db.users.create_index("email", unique=True),
+        db.sessions.create_index([("user_id", 1), ("created_at", -1)]),
+        db.questions.create_index([("session_id", 1), ("order_index", 1)]),
+        db.answers.create_index([("session_id", 1), ("question_id", 1)]),
+        db.scores.create_index("answer_id"),
+        db.reports.create_index("session_id", unique=True),
+        db.embeddings.create_index([("artifact_id", 1), ("chunk_idx", 1)]),
+        db.embeddings.create_index("bucket"),
+        # Text indexes for search
+        db.embeddings.create_index([("content", "text")]),
+        db.artifacts.create_index([("text", "text")]),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, OperationFailure) and result.code in INDEX_CONFLICT_CODES:
+            print(f"ℹ️  Index already exists with other options, leaving it: {result}")
+        elif isinstance(result, Exception):
+            raise result
+    
+    # Embeddings carry their artifact's type/meta; fill in older documents
+    await backfill_artifact_fields(db)
     
-    # Create text indexes for search
-    await db.embeddings.create_index([("content", "text")])
-    await db.artifacts.create_index([("text", "text")])
+    # Atlas Vector Search index for similarity queries (skipped on self-hosted MongoDB)
+    if await ensure_vector_index(db, get_embedding_provider().embedding_dim):
+        print("✅ Vector search index ready")
     
     print("✅ Indexes created successfully")
     
@@ -50,7 +77,7 @@ async def seed_demo_data():
     # Create a demo user
     demo_user = User(
         email="demo@example.com",
-        hashed_password="$2b$12$demo_hashed_password",  # This should be properly hashed
+        hashed_password=DEMO_PASSWORD_HASH,
         full_name="Demo User",
         is_active=True,
         is_superuser=False
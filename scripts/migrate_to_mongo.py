@@ -7,8 +7,9 @@ Run this script to migrate existing data before switching to MongoDB
 import asyncio
 import os
 from datetime import datetime
-from typing import Dict, Any, List
-from sqlalchemy import create_engine
+from typing import Dict, Any, List, Callable
+import numpy as np
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
@@ -22,6 +23,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import new models (MongoDB)
 from core.models import User, Session, Artifact, Question, Answer, Score, Report, Embedding
+from rag.store_mongo import VECTOR_SCAN_BUCKETS, _normalize_rows, _pack_vector
+
+# Rows read per server-side cursor fetch and documents per insert_many
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
 
 
 class DataMigrator:
@@ -41,15 +46,27 @@ class DataMigrator:
             document_models=[User, Session, Artifact, Question, Answer, Score, Report, Embedding]
         )
     
+    async def _copy_rows(self, query: str, collection, to_doc: Callable[[Any], Dict[str, Any]]) -> int:
+        """Stream query results through a server-side cursor into collection in batches"""
+        copied = 0
+        with self.pg_engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=MIGRATION_BATCH_SIZE
+            ).execute(text(query))
+            for rows in result.partitions(MIGRATION_BATCH_SIZE):
+                await collection.insert_many([to_doc(row) for row in rows], ordered=False)
+                copied += len(rows)
+        return copied
+    
     async def migrate_users(self):
         """Migrate users from PostgreSQL to MongoDB"""
         print("🔄 Migrating users...")
         
-        # This is a template - you'll need to adjust based on your actual old models
-        # pg_users = self.pg_session.query(OldUser).all()
-        
-        # for pg_user in pg_users:
-        #     mongo_user = User(
+        # This is a template - you'll need to adjust based on your actual old models.
+        # Stream rows in batches rather than loading the table with .all():
+        # batch = []
+        # for pg_user in self.pg_session.query(OldUser).yield_per(MIGRATION_BATCH_SIZE):
+        #     batch.append(User(
         #         id=str(pg_user.id),
         #         email=pg_user.email,
         #         hashed_password=pg_user.hashed_password,
@@ -58,8 +75,12 @@ class DataMigrator:
         #         is_superuser=pg_user.is_superuser,
         #         created_at=pg_user.created_at,
         #         updated_at=pg_user.updated_at
-        #     )
-        #     await mongo_user.insert()
+        #     ).dict(by_alias=True))
+        #     if len(batch) == MIGRATION_BATCH_SIZE:
+        #         await self.mongo_db.users.insert_many(batch, ordered=False)
+        #         batch.clear()
+        # if batch:
+        #     await self.mongo_db.users.insert_many(batch, ordered=False)
         
         print("✅ Users migrated")
     
@@ -68,8 +89,8 @@ class DataMigrator:
         print("🔄 Migrating artifacts...")
         
         # Similar pattern for artifacts
-        # pg_artifacts = self.pg_session.query(OldArtifact).all()
-        # ... migration logic
+        # for pg_artifact in self.pg_session.query(OldArtifact).yield_per(MIGRATION_BATCH_SIZE):
+        # ... migration logic, flushed with insert_many(batch, ordered=False)
         
         print("✅ Artifacts migrated")
     
@@ -103,7 +124,37 @@ class DataMigrator:
     async def migrate_embeddings(self):
         """Migrate embeddings from PostgreSQL to MongoDB"""
         print("🔄 Migrating embeddings...")
-        print("✅ Embeddings migrated")
+        
+        # The largest table: streamed so neither psycopg2 nor Python holds all vectors
+        def to_doc(row) -> Dict[str, Any]:
+            vector = np.asarray(
+                row.embedding if not isinstance(row.embedding, str) else row.embedding.strip("[]").split(","),
+                dtype=np.float32
+            )
+            return {
+                "_id": str(row.id),
+                "artifact_id": str(row.artifact_id),
+                "chunk_idx": row.chunk_idx,
+                "content": row.content,
+                "embedding": _pack_vector(_normalize_rows(vector)[0]),
+                "artifact_type": row.artifact_type,
+                "artifact_meta": row.artifact_meta,
+                "bucket": row.chunk_idx % VECTOR_SCAN_BUCKETS,
+                "created_at": row.created_at,
+            }
+        
+        copied = await self._copy_rows(
+            """
+            SELECT e.id, e.artifact_id, e.chunk_idx, e.content, e.embedding, e.created_at,
+                   a.type AS artifact_type, a.meta AS artifact_meta
+            FROM embeddings e
+            JOIN artifacts a ON e.artifact_id = a.id
+            WHERE e.embedding IS NOT NULL
+            """,
+            self.mongo_db.embeddings,
+            to_doc
+        )
+        print(f"✅ Embeddings migrated ({copied})")
     
     async def run_migration(self):
         """Run the complete migration"""
@@ -4,25 +4,166 @@ Demo seeding script for Interview Coach API
 Creates sample users, CV/JD artifacts, and a demo interview session
 """
 
+import asyncio
 import os
 import sys
-import uuid
 from datetime import datetime
 
-# Add the project root to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add the project root to the Python path when run as a script
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.db import get_db_context
+from core.db import connect_to_mongo, close_mongo_connection
 from core.models import User, Artifact, Session, Question, Answer, Score, Report
-from apps.api.deps.auth import get_password_hash
-from interview.question import get_question_generator
-from interview.evaluate.judge import get_llm_judge_evaluator
 
 
-def create_demo_user(db):
+# bcrypt hash of the demo password "demo123", precomputed so seeding skips the
+# deliberately slow KDF; regenerate it if the demo password ever changes
+DEMO_PASSWORD_HASH = os.getenv(
+    "DEMO_PASSWORD_HASH", "$2b$12$bA1x55xtg53q30697zqt5.Guk9IGbznv/KP4xIV/AqIF5lMWN.Wh2"
+)
+
+# Evaluations in flight at once; keeps the concurrent judge calls under the LLM rate limit
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+
+# Fixed demo content, built once at import; rows copy from these rather than
+# mutating them, and tests can import them directly
+QUESTIONS_DATA = (
+    {
+        "competency": "technical",
+        "difficulty": "medium",
+        "text": "Can you walk me through a technical challenge you faced in your previous role as a Senior Backend Engineer? What was the problem, how did you approach it, and what was the outcome?",
+        "order_index": 0,
+        "meta": {
+            "expected_signals": [
+                "Problem identification and analysis",
+                "Technical solution design",
+                "Implementation approach",
+                "Results and impact measurement"
+            ],
+            "pitfalls": [
+                "Vague problem description",
+                "No technical details",
+                "Missing outcome/results"
+            ]
+        }
+    },
+    {
+        "competency": "leadership",
+        "difficulty": "hard",
+        "text": "Tell me about a time when you had to lead a team through a major change or transition. How did you approach it?",
+        "order_index": 1,
+        "meta": {
+            "expected_signals": [
+                "Change management approach",
+                "Team communication",
+                "Stakeholder management",
+                "Results and impact"
+            ],
+            "pitfalls": [
+                "No change management strategy",
+                "Poor communication",
+                "No measurable results"
+            ]
+        }
+    },
+    {
+        "competency": "problem_solving",
+        "difficulty": "medium",
+        "text": "How would you design a scalable system to handle high-traffic data processing? Walk me through your architecture decisions.",
+        "order_index": 2,
+        "meta": {
+            "expected_signals": [
+                "System design principles",
+                "Scalability considerations",
+                "Technology choices",
+                "Trade-off analysis"
+            ],
+            "pitfalls": [
+                "Over-engineering",
+                "No scalability discussion",
+                "Missing trade-offs"
+            ]
+        }
+    },
+    {
+        "competency": "communication",
+        "difficulty": "easy",
+        "text": "How do you explain complex technical concepts to non-technical stakeholders?",
+        "order_index": 3,
+        "meta": {
+            "expected_signals": [
+                "Audience adaptation",
+                "Simplification skills",
+                "Examples usage",
+                "Feedback incorporation"
+            ],
+            "pitfalls": [
+                "Technical jargon",
+                "No audience consideration",
+                "No examples"
+            ]
+        }
+    },
+    {
+        "competency": "behavioral",
+        "difficulty": "medium",
+        "text": "Describe a situation where you had to meet a tight deadline. How did you prioritize and manage your work?",
+        "order_index": 4,
+        "meta": {
+            "expected_signals": [
+                "Time management",
+                "Prioritization skills",
+                "Communication with stakeholders",
+                "Quality maintenance"
+            ],
+            "pitfalls": [
+                "No prioritization strategy",
+                "Quality compromise",
+                "No stakeholder communication"
+            ]
+        }
+    }
+)
+
+SAMPLE_ANSWERS = (
+    "In my previous role at TechCorp, I faced a challenge where our API response times were increasing due to database query performance issues. I started by analyzing the slow queries using database monitoring tools and identified that certain joins were causing bottlenecks. I implemented Redis caching for frequently accessed data and optimized the database queries by adding proper indexes. This resulted in a 40% reduction in API response times and improved user experience significantly.",
+
+    "When our company decided to migrate from a monolithic architecture to microservices, I led a team of 5 developers through this transition. I began by creating a detailed migration plan and communicating the benefits and challenges to the team. I organized training sessions on microservices best practices and set up regular check-ins to address concerns. We successfully migrated three core services within 6 months, and the team became more confident with the new architecture.",
+
+    "For a high-traffic data processing system, I would start with a distributed architecture using message queues like Apache Kafka for data ingestion. I'd implement horizontal scaling with multiple processing nodes and use Redis for caching frequently accessed data. I'd choose PostgreSQL for structured data and consider NoSQL solutions like MongoDB for flexible schema requirements. The key trade-offs would be between consistency and availability, and I'd implement eventual consistency patterns where appropriate.",
+
+    "I adapt my communication based on the stakeholder's background. For executives, I focus on business impact and high-level architecture. I use analogies and visual diagrams to explain complex concepts, like comparing a microservices architecture to a restaurant kitchen where different chefs handle different dishes. I always ask for feedback to ensure understanding and adjust my explanation accordingly.",
+
+    "When I had to deliver a critical feature within a tight deadline, I first assessed the scope and identified what was truly essential versus nice-to-have. I broke down the work into smaller, manageable tasks and estimated effort for each. I communicated the timeline and potential risks to stakeholders early and set up daily check-ins. I maintained code quality by writing tests and doing code reviews, even under time pressure."
+)
+
+
+async def find_existing_demo():
+    """Look up the demo user, then its session and report id in a single aggregate"""
+    user = await User.find_one(User.email == "demo@example.com")
+    if not user:
+        return None, None, None
+    
+    rows = await Session.aggregate([
+        {"$match": {"user_id": user.id, "role": "Senior Backend Engineer"}},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": Report.get_collection_name(),
+            "localField": "_id",
+            "foreignField": "session_id",
+            "as": "reports",
+        }},
+    ]).to_list(1)
+    if not rows:
+        return user, None, None
+    reports = rows[0].pop("reports")
+    session = Session.model_validate(rows[0])
+    return user, session, reports[0]["_id"] if reports else None
+
+
+async def create_demo_user(existing_user=None):
     """Create a demo user"""
-    # Check if demo user already exists
-    existing_user = db.query(User).filter(User.email == "demo@example.com").first()
     if existing_user:
         print("Demo user already exists")
         return existing_user
@@ -30,22 +171,25 @@ def create_demo_user(db):
     # Create demo user
     demo_user = User(
         email="demo@example.com",
-        hashed_password=get_password_hash("demo123"),
+        hashed_password=DEMO_PASSWORD_HASH,
         full_name="Demo User",
         is_active=True,
         is_superuser=False
     )
     
-    db.add(demo_user)
-    db.commit()
-    db.refresh(demo_user)
+    await demo_user.insert()
     
     print(f"Created demo user: {demo_user.email}")
     return demo_user
 
 
-def create_sample_cv(db):
-    """Create a sample CV artifact"""
+async def create_sample_cv(existing_id=None):
+    """Create a sample CV artifact (reusing the demo session's one on re-runs)"""
+    existing = await Artifact.get(existing_id) if existing_id else None
+    if existing:
+        print(f"Sample CV artifact already exists: {existing.id}")
+        return existing
+    
     cv_text = """
 John Doe - Senior Backend Engineer
 
@@ -87,16 +231,19 @@ Python, FastAPI, Django, PostgreSQL, Redis, AWS, Docker, Kubernetes, Git, Agile
         }
     )
     
-    db.add(cv_artifact)
-    db.commit()
-    db.refresh(cv_artifact)
+    await cv_artifact.insert()
     
     print(f"Created sample CV artifact: {cv_artifact.id}")
     return cv_artifact
 
 
-def create_sample_jd(db):
-    """Create a sample job description artifact"""
+async def create_sample_jd(existing_id=None):
+    """Create a sample job description artifact (reusing the demo session's one on re-runs)"""
+    existing = await Artifact.get(existing_id) if existing_id else None
+    if existing:
+        print(f"Sample JD artifact already exists: {existing.id}")
+        return existing
+    
     jd_text = """
 Senior Backend Engineer - TechCorp Inc.
 
@@ -147,22 +294,14 @@ BENEFITS
         }
     )
     
-    db.add(jd_artifact)
-    db.commit()
-    db.refresh(jd_artifact)
+    await jd_artifact.insert()
     
     print(f"Created sample JD artifact: {jd_artifact.id}")
     return jd_artifact
 
 
-def create_demo_session(db, user, cv_artifact, jd_artifact):
+async def create_demo_session(user, cv_artifact, jd_artifact, existing_session=None):
     """Create a demo interview session"""
-    # Check if demo session already exists
-    existing_session = db.query(Session).filter(
-        Session.user_id == user.id,
-        Session.role == "Senior Backend Engineer"
-    ).first()
-    
     if existing_session:
         print("Demo session already exists")
         return existing_session
@@ -180,217 +319,140 @@ def create_demo_session(db, user, cv_artifact, jd_artifact):
         total_questions=5
     )
     
-    db.add(demo_session)
-    db.commit()
-    db.refresh(demo_session)
+    await demo_session.insert()
     
     print(f"Created demo session: {demo_session.id}")
     return demo_session
 
 
-def create_sample_questions(db, session):
-    """Create sample questions for the demo session"""
-    questions_data = [
-        {
-            "competency": "technical",
-            "difficulty": "medium",
-            "text": "Can you walk me through a technical challenge you faced in your previous role as a Senior Backend Engineer? What was the problem, how did you approach it, and what was the outcome?",
-            "order_index": 0,
-            "meta": {
-                "expected_signals": [
-                    "Problem identification and analysis",
-                    "Technical solution design",
-                    "Implementation approach",
-                    "Results and impact measurement"
-                ],
-                "pitfalls": [
-                    "Vague problem description",
-                    "No technical details",
-                    "Missing outcome/results"
-                ]
-            }
-        },
-        {
-            "competency": "leadership",
-            "difficulty": "hard",
-            "text": "Tell me about a time when you had to lead a team through a major change or transition. How did you approach it?",
-            "order_index": 1,
-            "meta": {
-                "expected_signals": [
-                    "Change management approach",
-                    "Team communication",
-                    "Stakeholder management",
-                    "Results and impact"
-                ],
-                "pitfalls": [
-                    "No change management strategy",
-                    "Poor communication",
-                    "No measurable results"
-                ]
-            }
-        },
-        {
-            "competency": "problem_solving",
-            "difficulty": "medium",
-            "text": "How would you design a scalable system to handle high-traffic data processing? Walk me through your architecture decisions.",
-            "order_index": 2,
-            "meta": {
-                "expected_signals": [
-                    "System design principles",
-                    "Scalability considerations",
-                    "Technology choices",
-                    "Trade-off analysis"
-                ],
-                "pitfalls": [
-                    "Over-engineering",
-                    "No scalability discussion",
-                    "Missing trade-offs"
-                ]
-            }
-        },
-        {
-            "competency": "communication",
-            "difficulty": "easy",
-            "text": "How do you explain complex technical concepts to non-technical stakeholders?",
-            "order_index": 3,
-            "meta": {
-                "expected_signals": [
-                    "Audience adaptation",
-                    "Simplification skills",
-                    "Examples usage",
-                    "Feedback incorporation"
-                ],
-                "pitfalls": [
-                    "Technical jargon",
-                    "No audience consideration",
-                    "No examples"
-                ]
-            }
-        },
-        {
-            "competency": "behavioral",
-            "difficulty": "medium",
-            "text": "Describe a situation where you had to meet a tight deadline. How did you prioritize and manage your work?",
-            "order_index": 4,
-            "meta": {
-                "expected_signals": [
-                    "Time management",
-                    "Prioritization skills",
-                    "Communication with stakeholders",
-                    "Quality maintenance"
-                ],
-                "pitfalls": [
-                    "No prioritization strategy",
-                    "Quality compromise",
-                    "No stakeholder communication"
-                ]
-            }
-        }
-    ]
-    
-    questions = []
-    for q_data in questions_data:
-        question = Question(
-            session_id=session.id,
-            **q_data
-        )
-        db.add(question)
-        questions.append(question)
+async def create_sample_questions(session):
+    """Create the sample questions the demo session does not have yet"""
+    existing = await Question.find(Question.session_id == session.id).to_list()
+    seeded = {question.order_index for question in existing}
     
-    db.commit()
+    # Ids come from the model's default factory: one insert_many round-trip
+    created = [
+        Question(session_id=session.id, **q_data)
+        for q_data in QUESTIONS_DATA if q_data["order_index"] not in seeded
+    ]
+    if created:
+        await Question.insert_many(created)
     
-    print(f"Created {len(questions)} sample questions")
-    return questions
+    print(f"Created {len(created)} sample questions ({len(existing)} already present)")
+    return sorted(existing + created, key=lambda question: question.order_index)
 
 
-def create_sample_answers(db, session, questions):
-    """Create sample answers for the demo session"""
-    sample_answers = [
-        "In my previous role at TechCorp, I faced a challenge where our API response times were increasing due to database query performance issues. I started by analyzing the slow queries using database monitoring tools and identified that certain joins were causing bottlenecks. I implemented Redis caching for frequently accessed data and optimized the database queries by adding proper indexes. This resulted in a 40% reduction in API response times and improved user experience significantly.",
-        
-        "When our company decided to migrate from a monolithic architecture to microservices, I led a team of 5 developers through this transition. I began by creating a detailed migration plan and communicating the benefits and challenges to the team. I organized training sessions on microservices best practices and set up regular check-ins to address concerns. We successfully migrated three core services within 6 months, and the team became more confident with the new architecture.",
-        
-        "For a high-traffic data processing system, I would start with a distributed architecture using message queues like Apache Kafka for data ingestion. I'd implement horizontal scaling with multiple processing nodes and use Redis for caching frequently accessed data. I'd choose PostgreSQL for structured data and consider NoSQL solutions like MongoDB for flexible schema requirements. The key trade-offs would be between consistency and availability, and I'd implement eventual consistency patterns where appropriate.",
-        
-        "I adapt my communication based on the stakeholder's background. For executives, I focus on business impact and high-level architecture. I use analogies and visual diagrams to explain complex concepts, like comparing a microservices architecture to a restaurant kitchen where different chefs handle different dishes. I always ask for feedback to ensure understanding and adjust my explanation accordingly.",
-        
-        "When I had to deliver a critical feature within a tight deadline, I first assessed the scope and identified what was truly essential versus nice-to-have. I broke down the work into smaller, manageable tasks and estimated effort for each. I communicated the timeline and potential risks to stakeholders early and set up daily check-ins. I maintained code quality by writing tests and doing code reviews, even under time pressure."
-    ]
-    
-    answers = []
-    for i, (question, answer_text) in enumerate(zip(questions, sample_answers)):
-        answer = Answer(
+async def create_sample_answers(session, questions):
+    """Create the sample answers the demo session does not have yet; one per question, in order"""
+    existing = {
+        answer.question_id: answer
+        for answer in await Answer.find(Answer.session_id == session.id).to_list()
+    }
+    created = [
+        Answer(
             session_id=session.id,
             question_id=question.id,
             text=answer_text,
             meta={"sample_answer": True}
         )
-        db.add(answer)
-        answers.append(answer)
-    
-    db.commit()
+        for question, answer_text in zip(questions, SAMPLE_ANSWERS)
+        if question.id not in existing
+    ]
+    if created:
+        await Answer.insert_many(created)
     
-    print(f"Created {len(answers)} sample answers")
-    return answers
+    print(f"Created {len(created)} sample answers ({len(existing)} already present)")
+    by_question = {**existing, **{answer.question_id: answer for answer in created}}
+    return [by_question[question.id] for question in questions]
 
 
-def create_sample_scores(db, answers, questions):
-    """Create sample scores for the demo answers"""
-    evaluator = get_llm_judge_evaluator()
+async def create_sample_scores(answers, questions, cv_artifact, jd_artifact):
+    """Score the demo answers that have no score yet; one score per answer, in order"""
+    existing = {
+        score.answer_id: score
+        for score in await Score.find({"answer_id": {"$in": [answer.id for answer in answers]}}).to_list()
+    }
+    pending = [
+        (answer, question) for answer, question in zip(answers, questions)
+        if answer.id not in existing
+    ]
     
-    scores = []
-    for answer, question in zip(answers, questions):
-        # Evaluate the answer
-        evaluation = evaluator.evaluate_answer(
-            answer_text=answer.text,
-            question_meta=question.meta
-        )
-        
-        # Create score record
-        score = Score(
+    # Deferred: the judge pulls in the LLM stack, which re-runs never reach
+    from interview.evaluate.judge import evaluate_answer
+    
+    # Run the evaluations concurrently (at most LLM_CONCURRENCY at a time),
+    # then write all scores in one insert_many
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    
+    async def evaluate(answer, question):
+        async with semaphore:
+            return await evaluate_answer(
+                user_answer=answer.text,
+                question=question.text,
+                jd=jd_artifact.text,
+                cv=cv_artifact.text,
+                stage=question.competency
+            )
+    
+    evaluations = await asyncio.gather(*(
+        evaluate(answer, question) for answer, question in pending
+    ))
+    
+    # The judge rates clarity, confidence and technical depth (1-10); rubric
+    # dimensions it does not rate are stored as 0
+    created = [
+        Score(
             answer_id=answer.id,
-            rubric_json=evaluation.dict(),
-            clarity=evaluation.scores.clarity,
-            structure=evaluation.scores.structure,
-            depth_specificity=evaluation.scores.depth_specificity,
-            role_fit=evaluation.scores.role_fit,
-            technical=evaluation.scores.technical,
-            communication=evaluation.scores.communication,
-            ownership=evaluation.scores.ownership,
-            total_score=evaluation.scores.total_score,
+            rubric_json=evaluation,
+            clarity=evaluation["clarity"],
+            structure=0,
+            depth_specificity=0,
+            role_fit=0,
+            technical=evaluation["technical_depth"],
+            communication=evaluation["confidence"],
+            ownership=0,
+            total_score=round(
+                (evaluation["clarity"] + evaluation["confidence"] + evaluation["technical_depth"]) / 3, 2
+            ),
             meta={"sample_score": True}
         )
-        
-        db.add(score)
-        scores.append(score)
+        for (answer, _), evaluation in zip(pending, evaluations)
+    ]
+    if created:
+        await Score.insert_many(created)
     
-    db.commit()
+    print(f"Created {len(created)} sample scores ({len(existing)} already present)")
+    by_answer = {**existing, **{score.answer_id: score for score in created}}
+    return [by_answer[answer.id] for answer in answers]
+
+
+def _aggregate_scores(scores, questions):
+    """Overall mean and per-competency mean total_score, in one vectorized pass"""
+    import numpy as np
     
-    print(f"Created {len(scores)} sample scores")
-    return scores
+    if not scores:
+        return 0.0, {}
+    values = np.asarray([score.total_score for score in scores], dtype=np.float64)
+    competencies, idx = np.unique(
+        [question.competency for question in questions[:len(values)]], return_inverse=True
+    )
+    totals = np.zeros(len(competencies))
+    np.add.at(totals, idx, values)
+    means = totals / np.bincount(idx, minlength=len(competencies))
+    return float(values.mean()), {
+        str(competency): round(float(mean), 2) for competency, mean in zip(competencies, means)
+    }
 
 
-def create_sample_report(db, session, scores):
+async def create_sample_report(session, scores, questions):
     """Create a sample report for the demo session"""
-    # Check if report already exists
-    existing_report = db.query(Report).filter(Report.session_id == session.id).first()
-    if existing_report:
-        print("Sample report already exists")
-        return existing_report
-    
-    # Calculate overall score
-    total_score = sum(score.total_score for score in scores) / len(scores) if scores else 0.0
+    # Calculate overall and per-competency scores (scores line up with questions)
+    total_score, competency_breakdown = _aggregate_scores(scores, questions)
     
     # Generate report data
     report_data = {
         "overall_score": total_score,
-        "competency_breakdown": {
-            "technical": 4.2,
-            "leadership": 4.0,
-            "problem_solving": 4.1,
-            "communication": 4.3,
-            "behavioral": 4.0
-        },
+        "competency_breakdown": competency_breakdown,
         "strengths": [
             "Strong technical problem-solving skills",
             "Clear communication and explanation abilities",
@@ -411,7 +473,7 @@ def create_sample_report(db, session, scores):
     
     report = Report(
         session_id=session.id,
-        json=report_data,
+        report_json=report_data,
         summary="Strong candidate with excellent technical skills and leadership potential. Demonstrates clear communication and problem-solving abilities.",
         overall_score=total_score,
         strengths=report_data["strengths"],
@@ -419,60 +481,78 @@ def create_sample_report(db, session, scores):
         recommendations=report_data["recommendations"]
     )
     
-    db.add(report)
-    db.commit()
-    db.refresh(report)
+    await report.insert()
     
     print(f"Created sample report: {report.id}")
     return report
 
 
-def main():
+async def main():
     """Main seeding function"""
     print("Starting demo data seeding...")
     
     try:
-        with get_db_context() as db:
-            # Create demo user
-            user = create_demo_user(db)
-            
-            # Create sample artifacts
-            cv_artifact = create_sample_cv(db)
-            jd_artifact = create_sample_jd(db)
-            
-            # Create demo session
-            session = create_demo_session(db, user, cv_artifact, jd_artifact)
-            
-            # Create sample questions
-            questions = create_sample_questions(db, session)
-            
-            # Create sample answers
-            answers = create_sample_answers(db, session, questions)
-            
-            # Create sample scores
-            scores = create_sample_scores(db, answers, questions)
-            
-            # Create sample report
-            report = create_sample_report(db, session, scores)
-            
-            print("\nDemo data seeding completed successfully!")
-            print(f"Demo user: {user.email} (password: demo123)")
-            print(f"Demo session: {session.id}")
-            print(f"Sample CV: {cv_artifact.id}")
-            print(f"Sample JD: {jd_artifact.id}")
-            print(f"Questions created: {len(questions)}")
-            print(f"Answers created: {len(answers)}")
-            print(f"Scores created: {len(scores)}")
-            print(f"Report created: {report.id}")
-            
+        await connect_to_mongo()
+        
+        existing_user, existing_session, existing_report_id = await find_existing_demo()
+        
+        # A report is the last thing seeded, so its presence means the
+        # full demo set exists: skip the artifact/session/LLM work
+        if existing_report_id:
+            print(f"Demo data already seeded (report: {existing_report_id})")
+            return 0
+        
+        # Each stage below reuses what an interrupted earlier run already wrote,
+        # so a re-run completes the demo set instead of duplicating it
+        
+        # Create demo user
+        user = await create_demo_user(existing_user)
+        
+        # Create sample artifacts (independent inserts, so issued together)
+        cv_artifact, jd_artifact = await asyncio.gather(
+            create_sample_cv(existing_session and existing_session.cv_file_id),
+            create_sample_jd(existing_session and existing_session.jd_file_id)
+        )
+        
+        # Create demo session
+        session = await create_demo_session(user, cv_artifact, jd_artifact, existing_session)
+        
+        # Create sample questions
+        questions = await create_sample_questions(session)
+        
+        # Create sample answers
+        answers = await create_sample_answers(session, questions)
+        
+        # Create sample scores
+        scores = await create_sample_scores(answers, questions, cv_artifact, jd_artifact)
+        
+        # Create sample report
+        report = await create_sample_report(session, scores, questions)
+        
+        print("\nDemo data seeding completed successfully!")
+        print(f"Demo user: {user.email} (password: demo123)")
+        print(f"Demo session: {session.id}")
+        print(f"Sample CV: {cv_artifact.id}")
+        print(f"Sample JD: {jd_artifact.id}")
+        print(f"Questions created: {len(questions)}")
+        print(f"Answers created: {len(answers)}")
+        print(f"Scores created: {len(scores)}")
+        print(f"Report created: {report.id}")
+        
     except Exception as e:
         print(f"Error during seeding: {e}")
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        # The judge is only imported when scores were pending
+        judge = sys.modules.get("interview.evaluate.judge")
+        if judge is not None:
+            await judge.close_client()
+        await close_mongo_connection()
     
     return 0
 
 
 if __name__ == "__main__":
-    exit(main())
+    exit(asyncio.run(main()))
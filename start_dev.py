@@ -10,49 +10,59 @@ import subprocess
 import time
 
 def run_command(command, description):
-    """Run a command and handle errors"""
+    """Run a command (argv list), streaming its output as it runs"""
     print(f"\n🔄 {description}...")
-    print(f"Running: {command}")
+    print(f"Running: {' '.join(command)}")
     
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
-        if result.stdout:
-            print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
+        # No shell, stderr merged into stdout and echoed line by line
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, text=True
+        ) as proc:
+            for line in proc.stdout:
+                print(line, end="")
+            returncode = proc.wait()
+    except OSError as e:
+        print(f"❌ {description} failed: {e}")
+        return False
+    
+    if returncode != 0:
         print(f"❌ {description} failed:")
-        print(f"Error code: {e.returncode}")
-        if e.stdout:
-            print(f"stdout: {e.stdout}")
-        if e.stderr:
-            print(f"stderr: {e.stderr}")
+        print(f"Error code: {returncode}")
         return False
+    
+    print(f"✅ {description} completed successfully")
+    return True
 
 def check_docker():
     """Check if Docker is running"""
     print("🔍 Checking Docker status...")
     
+    # One probe: docker info fails when the daemon is down, and the timeout
+    # keeps a hung daemon from blocking startup
     try:
-        result = subprocess.run("docker --version", shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"✅ Docker is available: {result.stdout.strip()}")
-            
-            # Check if Docker daemon is running
-            result = subprocess.run("docker info", shell=True, capture_output=True, text=True)
-            if result.returncode == 0:
-                print("✅ Docker daemon is running")
-                return True
-            else:
-                print("❌ Docker daemon is not running")
-                print("Please start Docker Desktop or the Docker service")
-                return False
-        else:
-            print("❌ Docker is not available")
-            return False
+        result = subprocess.run(
+            ["docker", "info", "--format", "{{.ServerVersion}}"],
+            capture_output=True, text=True, timeout=5
+        )
+    except FileNotFoundError:
+        print("❌ Docker is not available")
+        return False
+    except subprocess.TimeoutExpired:
+        print("❌ Docker daemon is not responding")
+        print("Please start Docker Desktop or the Docker service")
+        return False
     except Exception as e:
         print(f"❌ Error checking Docker: {e}")
         return False
+    
+    if result.returncode == 0:
+        print(f"✅ Docker daemon is running (server {result.stdout.strip()})")
+        return True
+    
+    print("❌ Docker daemon is not running")
+    print("Please start Docker Desktop or the Docker service")
+    return False
 
 def check_environment():
     """Check environment setup"""
@@ -117,7 +127,7 @@ def main():
         
         if choice == "1":
             print("\n🚀 Starting full development stack...")
-            if run_command("make dev-setup", "Starting development environment"):
+            if run_command(["make", "dev-setup"], "Starting development environment"):
                 print("\n🎉 Development environment is ready!")
                 print("\nServices available at:")
                 print("- API: http://localhost:8080")
@@ -134,7 +144,7 @@ def main():
             
         elif choice == "2":
             print("\n🚀 Starting database and Redis only...")
-            if run_command("make up", "Starting database and Redis"):
+            if run_command(["make", "up"], "Starting database and Redis"):
                 print("\n✅ Database and Redis are running")
                 print("To start the API, run: make up")
             else:
@@ -144,7 +154,7 @@ def main():
             
         elif choice == "3":
             print("\n🧪 Running tests...")
-            if run_command("make test", "Running tests"):
+            if run_command(["make", "test"], "Running tests"):
                 print("\n✅ Tests completed")
             else:
                 print("\n❌ Tests failed")
@@ -5,21 +5,17 @@ Tests speech-to-text conversion and voice analysis
 """
 
 import asyncio
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from interview.speech_to_text import speech_converter
-from interview.voice_analyzer import VoiceAnalyzer
 
 def test_audio_processing():
     """Test audio processing with sample data"""
+    # Deferred so importing this module does not load librosa and the STT stack
+    from interview.speech_to_text import speech_converter
+    from interview.voice_analyzer import voice_analyzer
+    
     print("🎤 Testing Audio Processing Functionality")
     print("=" * 50)
     
-    # Initialize components
-    voice_analyzer = VoiceAnalyzer()
-    
     # Test with empty audio (fallback behavior)
     print("\n1. Testing fallback behavior (no audio):")
     try:
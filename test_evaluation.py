@@ -1,7 +1,13 @@
+import json
 import os
 import httpx
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()  # load .env if not already loaded
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -10,11 +16,16 @@ GROQ_MODEL = os.getenv("LLM_MODEL", "llama-3.1-70b-versatile")
 if not GROQ_API_KEY:
     raise RuntimeError("❌ GROQ_API_KEY not set in environment!")
 
-url = "https://api.groq.com/openai/v1/chat/completions"
-headers = {
-    "Authorization": f"Bearer {GROQ_API_KEY}",
-    "Content-Type": "application/json",
-}
+# One pooled client: every request after the first reuses the open TLS connection
+client = httpx.Client(
+    base_url="https://api.groq.com",
+    headers={
+        "Authorization": f"Bearer {GROQ_API_KEY}",
+        "Content-Type": "application/json",
+    },
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=10),
+)
 payload = {
     "model": GROQ_MODEL,
     "messages": [{"role": "user", "content": "Hello Groq! Just say 'pong' if you can hear me."}],
@@ -22,7 +33,10 @@ payload = {
 }
 
 print("🔄 Sending test request to Groq...")
-resp = httpx.post(url, headers=headers, json=payload, timeout=30)
+with client:
+    resp = client.post("/openai/v1/chat/completions", json=payload)
 
-print("Status:", resp.status_code)
-print("Response:", resp.json())
+    print("Status:", resp.status_code)
+    result = orjson.loads(resp.content) if orjson else resp.json()
+    print("Response:")
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode() if orjson else json.dumps(result, indent=2))
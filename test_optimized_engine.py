@@ -5,14 +5,33 @@ Validates performance improvements
 """
 
 import asyncio
-import time
+import contextlib
+import io
 import sys
+import time
 
-# Add parent directory to path
-sys.path.insert(0, '/Users/karmansingh/Desktop/work/ai_interview/rahat_backend')
-
-from interview.optimized_engine import optimized_engine
+from interview.optimized_engine import content_hash, optimized_engine
 from interview.performance import monitor
+from tests.fixtures import ENGINE_CV, ENGINE_JD, ENGINE_JD_BRIEF
+
+# uvloop ships with uvicorn[standard]; use it for the script run like the server does
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None
+
+
+@contextlib.contextmanager
+def timer():
+    """Monotonic wall time of the block, in seconds, in t[0] after exit"""
+    t = [0.0]
+    start = time.perf_counter_ns()
+    try:
+        yield t
+    finally:
+        t[0] = (time.perf_counter_ns() - start) / 1e9
 
 
 async def test_session_creation():
@@ -21,43 +40,18 @@ async def test_session_creation():
     print("TEST 1: Session Creation & First Question")
     print("="*60)
     
-    sample_cv = """
-John Doe
-Senior Software Engineer
-
-Experience:
-- 5 years Python development
-- Expert in FastAPI, Django
-- Built microservices at scale
-- Led team of 4 engineers
-
-Skills: Python, FastAPI, PostgreSQL, Docker, Kubernetes
-    """
-    
-    sample_jd = """
-Senior Backend Engineer
-
-Requirements:
-- 5+ years Python experience
-- Strong FastAPI knowledge
-- Microservices architecture
-- Team leadership experience
-- Cloud platforms (AWS/GCP)
-    """
-    
-    start = time.time()
-    
     try:
-        result = await optimized_engine.create_session(
-            session_id="test_sess_001",
-            user_id="test_user_001",
-            role="Senior Backend Engineer",
-            company="TechCorp",
-            cv_text=sample_cv,
-            jd_text=sample_jd
-        )
+        with timer() as t:
+            result = await optimized_engine.create_session(
+                session_id="test_sess_001",
+                user_id="test_user_001",
+                role="Senior Backend Engineer",
+                company="TechCorp",
+                cv_text=ENGINE_CV,
+                jd_text=ENGINE_JD
+            )
         
-        elapsed = time.time() - start
+        elapsed = t[0]
         
         print(f"\n✅ Session created successfully")
         print(f"⏱️  Time taken: {elapsed:.2f}s")
@@ -81,15 +75,14 @@ async def test_answer_submission():
     At my current company, I lead a team of 4 engineers and we handle millions of requests daily.
     """
     
-    start = time.time()
-    
     try:
-        result = await optimized_engine.submit_answer(
-            session_id="test_sess_001",
-            answer=sample_answer
-        )
+        with timer() as t:
+            result = await optimized_engine.submit_answer(
+                session_id="test_sess_001",
+                answer=sample_answer
+            )
         
-        elapsed = time.time() - start
+        elapsed = t[0]
         
         print(f"\n✅ Answer submitted successfully")
         print(f"⏱️  Time taken: {elapsed:.2f}s")
@@ -110,40 +103,19 @@ async def test_cached_session():
     print("TEST 3: Cached CV Analysis")
     print("="*60)
     
-    sample_cv = """
-John Doe
-Senior Software Engineer
-
-Experience:
-- 5 years Python development
-- Expert in FastAPI, Django
-- Built microservices at scale
-- Led team of 4 engineers
-
-Skills: Python, FastAPI, PostgreSQL, Docker, Kubernetes
-    """
-    
-    sample_jd = """
-Senior Backend Engineer
-
-Requirements:
-- 5+ years Python experience
-- Strong FastAPI knowledge
-    """
-    
-    start = time.time()
-    
     try:
-        result = await optimized_engine.create_session(
-            session_id="test_sess_002",
-            user_id="test_user_001",
-            role="Senior Backend Engineer",
-            company="AnotherCorp",
-            cv_text=sample_cv,
-            jd_text=sample_jd
-        )
+        with timer() as t:
+            result = await optimized_engine.create_session(
+                session_id="test_sess_002",
+                user_id="test_user_001",
+                role="Senior Backend Engineer",
+                company="AnotherCorp",
+                cv_text=ENGINE_CV,
+                jd_text=ENGINE_JD_BRIEF,
+                cv_hash=content_hash(ENGINE_CV)
+            )
         
-        elapsed = time.time() - start
+        elapsed = t[0]
         
         print(f"\n✅ Cached session created successfully")
         print(f"⏱️  Time taken: {elapsed:.2f}s (should be faster!)")
@@ -163,18 +135,17 @@ async def run_all_tests():
     
     results = []
     
-    # Test 1: First session (uncached)
+    # Test 1: First session (uncached); also primes the CV analysis cache
     success1, time1 = await test_session_creation()
     results.append(("Session Creation (uncached)", success1, time1))
     
-    # Test 2: Answer submission
+    # Test 2: Answer submission. Tests 2 and 3 run one after the other so
+    # each timing measures that call alone, not two sharing the LLM and loop
     if success1:
-        await asyncio.sleep(1)  # Small delay
         success2, time2 = await test_answer_submission()
         results.append(("Answer Submission", success2, time2))
     
     # Test 3: Second session (cached CV)
-    await asyncio.sleep(1)
     success3, time3 = await test_cached_session()
     results.append(("Session Creation (cached)", success3, time3))
     
@@ -237,4 +208,12 @@ async def run_all_tests():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_all_tests())
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+    # Collect the report and write it in one go rather than one flush per print
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            asyncio.run(run_all_tests())
+    finally:
+        sys.stdout.write(buf.getvalue())